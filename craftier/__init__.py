@@ -1,8 +1,22 @@
+from typing import TYPE_CHECKING, Any
+
 import loguru
 
-from craftier.transformer import CraftierTransformer
+if TYPE_CHECKING:
+    from craftier.transformer import CraftierTransformer
 
 loguru.logger.disable("craftier")
 
 __version__ = "0.1.0"
 __all__ = ("CraftierTransformer",)
+
+
+def __getattr__(name: str) -> Any:
+    # CraftierTransformer is imported lazily, as it pulls libcst, which
+    # dominates the start up time of the CLI.
+    if name == "CraftierTransformer":
+        # pylint: disable=import-outside-toplevel,redefined-outer-name
+        from craftier.transformer import CraftierTransformer
+
+        return CraftierTransformer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,18 @@
 import importlib
-import inspect
 import pkgutil
+import sys
 import types
-from typing import Any, Iterator, Sequence, Set, Type, TypeVar
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
 
 
 class InvalidName(Exception):
@@ -15,20 +25,29 @@ class InvalidName(Exception):
 
 T = TypeVar("T", bound=Type[Any])
 
+_CLASSES_CACHE: Dict[Tuple[type, Tuple[str, ...]], List[Any]] = {}
+
 
 def from_qualified_names(
     base_class: T, qualified_names: Sequence[str]
 ) -> Sequence[T]:
     """Find all the subclasses from the target class in the given packages."""
-    classes: Set[T] = set()
-    for name in qualified_names:
-        classes.update(_from_package_name(base_class, name))
-    return sorted(classes, key=lambda class_: class_.__name__)
+    # The order matters, as it determines the order in which the transformers
+    # are applied, so the sorted result is cached instead.
+    key = (base_class, tuple(qualified_names))
+    classes = _CLASSES_CACHE.get(key)
+    if classes is None:
+        found: Dict[T, None] = {}
+        for name in qualified_names:
+            found.update(dict.fromkeys(_from_package_name(base_class, name)))
+        classes = sorted(found, key=lambda class_: class_.__name__)
+        _CLASSES_CACHE[key] = classes
+    return list(classes)
 
 
 def _from_package_name(base_class: T, qualified_name: str) -> Iterator[T]:
     try:
-        package = importlib.import_module(qualified_name)
+        package = _import(qualified_name)
     except ModuleNotFoundError:
         raise InvalidName(qualified_name) from None
 
@@ -43,13 +62,21 @@ def _from_package_name(base_class: T, qualified_name: str) -> Iterator[T]:
         package_path, prefix=f"{qualified_name}."
     ):
         try:
-            submodule = importlib.import_module(module_info.name)
+            submodule = _import(module_info.name)
         except ModuleNotFoundError:
             continue
         yield from _from_module(base_class, submodule)
 
 
+def _import(name: str) -> types.ModuleType:
+    # Avoid going through the import machinery for already loaded modules.
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return importlib.import_module(name)
+
+
 def _from_module(base_class: T, module: types.ModuleType) -> Iterator[T]:
-    for _, class_ in inspect.getmembers(module, inspect.isclass):
-        if issubclass(class_, base_class):
-            yield class_
+    for class_ in list(vars(module).values()):
+        if isinstance(class_, type) and issubclass(class_, base_class):
+            yield cast(T, class_)
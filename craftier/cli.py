@@ -1,16 +1,29 @@
 import collections
-import multiprocessing
+import itertools
 import pathlib
 import platform
 import statistics
 import sys
-from typing import Any, DefaultDict, List, Mapping, Optional, Sequence
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    DefaultDict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
 
 import click
 import click_pathlib
 from loguru import logger
 
-from craftier import config, performance, refactor
+# The modules below are imported lazily, as they pull libcst, which dominates
+# the start up time of the CLI, even when just printing the help.
+# pylint: disable=import-outside-toplevel
+if TYPE_CHECKING:
+    from craftier import refactor
 
 # Generated using
 # http://patorjk.com/software/taag/#p=display&f=Graceful&t=craftier
@@ -70,6 +83,10 @@ def _refactor(
     debug: bool,
 ) -> None:
     """Subcommand to refactor code."""
+    import multiprocessing
+
+    from craftier import config, performance, refactor
+
     # In Python 3.8 for Mac OS the default was changed from fork to spawn,
     # however that brings lot of undesired effects. For example the Pickling
     # of many structures, which is fragile and the errors are undecipherable.
@@ -113,7 +130,7 @@ def _refactor(
         performance.disable()
 
 
-def _fix_summary(result: refactor.Result) -> None:
+def _fix_summary(result: "refactor.Result") -> None:
     _print_performance_stats()
 
     for file in result.refactored:
@@ -155,23 +172,34 @@ def _pluralize(word: str, count: int) -> str:
 
 
 def _print_performance_stats() -> None:
-    data = performance.read()
+    from craftier import performance
+
     grouped_data: DefaultDict[
         str, List[Mapping[str, Any]]
     ] = collections.defaultdict(list)
-    for row in data:
+    for row in performance.read():
         grouped_data[row["name"]].append(row)
     for name in sorted(grouped_data.keys()):
         _print_single_performance_stats(name, grouped_data[name])
-    _print_single_performance_stats("Overall", data)
+    _print_single_performance_stats(
+        "Overall", itertools.chain.from_iterable(grouped_data.values())
+    )
 
 
 def _print_single_performance_stats(
-    name: str, data: Sequence[Mapping[str, Any]]
+    name: str, data: Iterable[Mapping[str, Any]]
 ) -> None:
-    modified = [row["time"] for row in data if row["status"] == "modified"]
-    unchanged = [row["time"] for row in data if row["status"] == "unchanged"]
-    values = [row["time"] for row in data]
+    modified: List[float] = []
+    unchanged: List[float] = []
+    values: List[float] = []
+    for row in data:
+        time = row["time"]
+        values.append(time)
+        status = row["status"]
+        if status == "modified":
+            modified.append(time)
+        elif status == "unchanged":
+            unchanged.append(time)
     logger.debug(
         "{}\tcount={}\ttotal={:.1f}ms\t{}\t{}\t{}",
         name,
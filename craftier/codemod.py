@@ -1,9 +1,13 @@
 import contextlib
 import dataclasses
-import inspect
+import itertools
 from typing import (
+    Any,
+    Callable,
     Dict,
+    FrozenSet,
     Generator,
+    Iterator,
     List,
     Mapping,
     MutableMapping,
@@ -11,6 +15,7 @@ from typing import (
     Protocol,
     Sequence,
     Type,
+    TypeVar,
     Union,
 )
 
@@ -19,6 +24,26 @@ import libcst.codemod
 import libcst.metadata
 from loguru import logger
 
+# Attribute of a leave method naming the only operator class it handles.
+_OPERATOR_ATTRIBUTE = "craftier_operator"
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def for_operator(operator_class: Type[libcst.CSTNode]) -> Callable[[_F], _F]:
+    """Declare that a leave method only handles nodes with this operator.
+
+    For example, a `leave_BinaryOperation` method only transforming additions
+    could use `libcst.Add`. The batched codemod will not call it for nodes with
+    a different operator.
+    """
+
+    def decorator(method: _F) -> _F:
+        setattr(method, _OPERATOR_ATTRIBUTE, operator_class)
+        return method
+
+    return decorator
+
 
 class _LeaveMethod(Protocol):
     __self__: "ContextAwareTransformer"
@@ -31,7 +56,50 @@ class _LeaveMethod(Protocol):
         ...
 
 
-CONTEXT_KEY = "craftier"
+# Names of the valid on_leave methods of each transformer class, keyed by the
+# class of the node they handle.
+_LEAVE_CACHE: Dict[type, Dict[Type[libcst.CSTNode], str]] = {}
+
+# Nodes found inside the leaf nodes below. They can only contain each other.
+_TRIVIA_NODES: FrozenSet[Type[libcst.CSTNode]] = frozenset(
+    (
+        libcst.LeftParen,
+        libcst.RightParen,
+        libcst.SimpleWhitespace,
+        libcst.ParenthesizedWhitespace,
+        libcst.TrailingWhitespace,
+        libcst.EmptyLine,
+        libcst.Comment,
+        libcst.Newline,
+    )
+)
+
+# Nodes whose descendants can only be trivia nodes.
+_LEAF_NODES: FrozenSet[Type[libcst.CSTNode]] = frozenset(
+    (
+        libcst.Name,
+        libcst.Integer,
+        libcst.Float,
+        libcst.Imaginary,
+        libcst.SimpleString,
+        libcst.Ellipsis,
+        libcst.Comma,
+        libcst.Dot,
+        libcst.Colon,
+        libcst.AssignEqual,
+        libcst.Semicolon,
+        *itertools.chain.from_iterable(
+            operator.__subclasses__()
+            for operator in (
+                libcst.BaseAugOp,
+                libcst.BaseBinaryOp,
+                libcst.BaseBooleanOp,
+                libcst.BaseCompOp,
+                libcst.BaseUnaryOp,
+            )
+        ),
+    )
+)
 
 
 class ContextAwareTransformer(libcst.codemod.Codemod, libcst.CSTTransformer):
@@ -42,25 +110,26 @@ class ContextAwareTransformer(libcst.codemod.Codemod, libcst.CSTTransformer):
     performed when visiting nodes.
     """
 
+    # The bases do not define __slots__, so instances still have a __dict__,
+    # but the slots make the access to these attributes faster.
+    __slots__ = ("context", "modified_flag")
+
     def __init__(self, context: libcst.codemod.CodemodContext) -> None:
         libcst.codemod.Codemod.__init__(self, context)
         libcst.CSTTransformer.__init__(self)
+        # Shared with the BatchedCodemod running this transformer, so that it
+        # knows whether the tree was modified in the current pass.
+        self.modified_flag = [False]
 
     def transform_module_impl(self, tree: libcst.Module) -> libcst.Module:
         return tree.visit(self)
 
     def get_leave_funcs(self) -> Mapping[str, _LeaveMethod]:
         """Return all the valid on_leave methods."""
-        methods = inspect.getmembers(
-            self,
-            lambda m: (
-                inspect.ismethod(m)
-                and m.__name__.startswith("leave_")
-                and not getattr(m, "_is_no_op", False)
-            ),
-        )
+        return {name: getattr(self, name) for name in _valid_leave_names(self)}
 
-        return dict(methods)
+    def _mark_as_modified(self) -> None:
+        self.modified_flag[0] = True
 
 
 class BatchedCodemod(libcst.codemod.Codemod, libcst.CSTTransformer):
@@ -75,41 +144,48 @@ class BatchedCodemod(libcst.codemod.Codemod, libcst.CSTTransformer):
         libcst.codemod.Codemod.__init__(self, context)
         libcst.CSTTransformer.__init__(self)
         self.max_executions = max_executions
-        self.leave_methods: MutableMapping[str, List[_LeaveMethod]] = {}
+        self.leave_methods: MutableMapping[
+            Type[libcst.CSTNode], List[_LeaveMethod]
+        ] = {}
         self.transformers = transformers
         self._batched_transformer: Optional[_BatchedTransformer] = None
+        self._modified_flag = [False]
+        self._needs_metadata = bool(self.get_inherited_dependencies()) or any(
+            transform_class.get_inherited_dependencies()
+            for transform_class in transformers
+        )
 
     def transform_module_impl(self, tree: libcst.Module) -> libcst.Module:
         """Transform the tree.
 
         Note: we do not use should_allow_multiple_passes, as that approach
         compares the trees using an expensive deep compare operation. Instead,
-        we use the information stored in the context by our transforms.
+        we use a modified flag shared with our transforms.
 
         This allow us to shave about 10% of the run time.
         """
         if not self._batched_transformer:
-            leave_methods: Dict[str, List[_LeaveMethod]] = {}
-            for transform_class in self.transformers:
-                for name, method in (
-                    transform_class(self.context).get_leave_funcs().items()
-                ):
-                    leave_methods.setdefault(
-                        name.replace("leave_", ""), []
-                    ).append(method)
-            self._batched_transformer = _BatchedTransformer(leave_methods)
-
-        self._batched_transformer.update_children_context(self.context)
+            # The batched transformer keeps per pass state, so it is owned by
+            # this codemod. Only the leave method names are cached per class.
+            self._batched_transformer = _build_batched_transformer(
+                self.context, self.transformers
+            )
+
+        self._batched_transformer.update_children_context(
+            self.context, self._modified_flag
+        )
 
         logger.debug("Checking {}", self.context.filename)
         was_modified = False
         modified_tree = tree
-        for _ in range(self.max_executions):
-            self._mark_as_not_modified()
+        for execution in range(self.max_executions):
+            self._modified_flag[0] = False
+            self._batched_transformer.start_pass(incremental=execution > 0)
             modified_tree = modified_tree.visit(self._batched_transformer)
-            if not self._modified():
+            if not self._modified_flag[0]:
                 break
             was_modified = True
+        self._batched_transformer.clear()
 
         # This is a hack to avoid converting an umodified tree to code. This
         # improves the running time by about 10%.
@@ -127,8 +203,15 @@ class BatchedCodemod(libcst.codemod.Codemod, libcst.CSTTransformer):
         Given that we know that CraftierTransform generate always different
         nodes, we can avoid the copy of the whole tree when building the
         metadata. This is an important performance optimization.
+
+        When no transformer declares metadata dependencies, the wrapper is not
+        built at all.
         """
-        oldwrapper = self.context.wrapper
+        if not self._needs_metadata:
+            yield module
+            return
+
+        oldcontext = self.context
         metadata_manager = self.context.metadata_manager
         filename = self.context.filename
         if metadata_manager and filename:
@@ -150,46 +233,221 @@ class BatchedCodemod(libcst.codemod.Codemod, libcst.CSTTransformer):
             try:
                 yield wrapper.module
             finally:
-                self.context = dataclasses.replace(
-                    self.context, wrapper=oldwrapper
-                )
+                # CodemodContext is frozen, so instead of building yet another
+                # copy, we restore the original one.
+                self.context = oldcontext
+
+
+def _build_batched_transformer(
+    context: libcst.codemod.CodemodContext,
+    transformers: Sequence[Type[ContextAwareTransformer]],
+) -> "_BatchedTransformer":
+    leave_methods: Dict[Type[libcst.CSTNode], List[_LeaveMethod]] = {}
+    for transform_class in transformers:
+        transformer = transform_class(context)
+        for node_class, method_name in _leave_method_names(transformer).items():
+            leave_methods.setdefault(node_class, []).append(
+                getattr(transformer, method_name)
+            )
+    return _BatchedTransformer(leave_methods)
 
-    def _mark_as_not_modified(self) -> None:
-        context = self.context.scratch.setdefault(CONTEXT_KEY, {})
-        context[self.context.filename] = False
 
-    def _modified(self) -> bool:
-        context = self.context.scratch.get(CONTEXT_KEY, {})
-        return bool(context[self.context.filename])
+def _leave_method_names(
+    transformer: ContextAwareTransformer,
+) -> Mapping[Type[libcst.CSTNode], str]:
+    """Return the names of the valid on_leave methods, keyed by node class.
+
+    The names are discovered only once per transformer class, after it was
+    instantiated, as `CraftierTransformer` binds its leave method to the class
+    when first initialized.
+    """
+    transform_class = type(transformer)
+    names = _LEAVE_CACHE.get(transform_class)
+    if names is None:
+        names = {}
+        for name in _valid_leave_names(transformer):
+            # Attribute leave methods, like leave_Call_args, do not map to a
+            # node class and are never dispatched.
+            node_class = getattr(libcst, name[len("leave_") :], None)
+            if isinstance(node_class, type) and issubclass(
+                node_class, libcst.CSTNode
+            ):
+                names[node_class] = name
+        _LEAVE_CACHE[transform_class] = names
+    return names
+
+
+def _valid_leave_names(transformer: ContextAwareTransformer) -> Iterator[str]:
+    """Yield the names of the leave methods which are not no-ops.
+
+    The namespaces are walked directly, instead of using `inspect.getmembers`,
+    which would check every single attribute of the transformer.
+    """
+    seen = set()
+    namespaces: List[Mapping[str, Any]] = [vars(transformer)]
+    namespaces.extend(vars(class_) for class_ in type(transformer).__mro__)
+    for namespace in namespaces:
+        for name, value in namespace.items():
+            if not name.startswith("leave_") or name in seen:
+                continue
+            seen.add(name)
+            if callable(value) and not getattr(value, "_is_no_op", False):
+                yield name
 
 
 class _BatchedTransformer(libcst.CSTTransformer):
+    # See ContextAwareTransformer.__slots__.
+    __slots__ = (
+        "leave_methods",
+        "_operator_methods",
+        "_skip_children",
+        "_rebuilt",
+        "_replaced",
+        "_visit_rebuilt",
+        "_visit_replaced",
+        "_incremental",
+        "_replaced_depth",
+        "_changed_children",
+    )
+
     def __init__(
         self,
-        leave_methods: MutableMapping[str, List[_LeaveMethod]],
+        leave_methods: MutableMapping[Type[libcst.CSTNode], List[_LeaveMethod]],
     ):
         libcst.CSTTransformer.__init__(self)
         self.leave_methods = leave_methods
+        # For node classes with methods declaring an operator, the methods
+        # applicable to each operator class. The key None holds the methods
+        # handling any operator.
+        self._operator_methods: Dict[
+            Type[libcst.CSTNode],
+            Dict[Optional[Type[libcst.CSTNode]], List[_LeaveMethod]],
+        ] = {}
+        for node_class, methods in leave_methods.items():
+            operators = [
+                getattr(method, _OPERATOR_ATTRIBUTE, None) for method in methods
+            ]
+            if not any(operators):
+                continue
+            self._operator_methods[node_class] = {
+                operator_class: [
+                    method
+                    for method, operator in zip(methods, operators)
+                    if operator is None or operator is operator_class
+                ]
+                for operator_class in {None, *operators}
+            }
+        # Avoid descending into nodes which cannot contain any node with
+        # registered leave methods. This is what dominates the traversal.
+        self._skip_children: FrozenSet[Type[libcst.CSTNode]] = (
+            _LEAF_NODES | _TRIVIA_NODES
+            if _TRIVIA_NODES.isdisjoint(leave_methods)
+            else frozenset()
+        )
+        # Nodes of the new tree which changed in the current pass, keyed by
+        # their id. Nodes are kept alive so that their ids are not reused.
+        # Replaced nodes are the ones returned by the leave methods, while
+        # rebuilt nodes are their ancestors. LibCST recreates every node whose
+        # children are visited, so being a new object does not mean a change.
+        self._rebuilt: Dict[int, libcst.CSTNode] = {}
+        self._replaced: Dict[int, libcst.CSTNode] = {}
+        # Nodes changed in the previous pass, which restrict the traversal of
+        # an incremental pass.
+        self._visit_rebuilt: Dict[int, libcst.CSTNode] = {}
+        self._visit_replaced: Dict[int, libcst.CSTNode] = {}
+        self._incremental = False
+        # Number of replaced nodes being traversed. Their whole subtree is new.
+        self._replaced_depth = 0
+        # Whether any child of each node being traversed changed, with the
+        # innermost node last.
+        self._changed_children: List[bool] = []
+
+    def start_pass(self, incremental: bool) -> None:
+        """Prepare the transformer for a new pass over the tree.
+
+        An incremental pass only visits the nodes replaced in the previous pass
+        and their ancestors. The rest of the nodes were already checked and the
+        result of the leave methods depends only on the node they are given.
+        """
+        if incremental:
+            self._visit_rebuilt = self._rebuilt
+            self._visit_replaced = self._replaced
+        else:
+            self._visit_rebuilt = {}
+            self._visit_replaced = {}
+        self._rebuilt = {}
+        self._replaced = {}
+        self._incremental = incremental
+        self._replaced_depth = 0
+        self._changed_children = []
+
+    def clear(self) -> None:
+        """Release the nodes tracked by the passes."""
+        self.start_pass(incremental=False)
 
     def on_visit(self, node: libcst.CSTNode) -> bool:
-        return True
+        self._changed_children.append(False)
+        if self._incremental:
+            if id(node) in self._visit_replaced:
+                self._replaced_depth += 1
+            elif (
+                not self._replaced_depth and id(node) not in self._visit_rebuilt
+            ):
+                return False
+        return node.__class__ not in self._skip_children
 
     def on_leave(
         self, original_node: libcst.CSTNodeT, updated_node: libcst.CSTNodeT
     ) -> Union[libcst.CSTNodeT, libcst.RemovalSentinel]:
+        changed = self._changed_children.pop()
+        if self._incremental:
+            if id(original_node) in self._visit_replaced:
+                self._replaced_depth -= 1
+            elif (
+                not self._replaced_depth
+                and id(original_node) not in self._visit_rebuilt
+            ):
+                return updated_node
+        new_updated_node = self._leave(original_node, updated_node)
+        if new_updated_node is not updated_node:
+            changed = True
+            if isinstance(new_updated_node, libcst.CSTNode):
+                self._replaced[id(new_updated_node)] = new_updated_node
+        elif changed:
+            self._rebuilt[id(updated_node)] = updated_node
+        if changed and self._changed_children:
+            self._changed_children[-1] = True
+        return new_updated_node
+
+    def _leave(
+        self, original_node: libcst.CSTNodeT, updated_node: libcst.CSTNodeT
+    ) -> Union[libcst.CSTNodeT, libcst.RemovalSentinel]:
+        """Apply the leave methods registered for the node."""
+        node_class = original_node.__class__
+        methods = self.leave_methods.get(node_class)
+        if not methods:
+            return updated_node
+        operator_class = None
+        operator_methods = self._operator_methods.get(node_class)
+        if operator_methods is not None:
+            operator_class = getattr(updated_node, "operator").__class__
+            methods = operator_methods.get(
+                operator_class, operator_methods[None]
+            )
         new_updated_node: Union[
             libcst.CSTNodeT, libcst.RemovalSentinel
         ] = updated_node
-        original_node_type = type(original_node)
-        for on_leave in self.leave_methods.get(original_node_type.__name__, []):
-            # We use type here to detect whether the returned node is still
-            # processable by these methods.
-            # pylint: disable=unidiomatic-typecheck
-            if type(updated_node) != original_node_type:
+        for on_leave in methods:
+            # Node classes are compared by identity to detect whether the
+            # returned node is still processable by these methods. The same
+            # applies to the operator, as the methods were selected for it.
+            if new_updated_node.__class__ is not node_class or (
+                operator_class is not None
+                and getattr(new_updated_node, "operator").__class__
+                is not operator_class
+            ):
                 break
             new_updated_node = on_leave(original_node, new_updated_node)
-            # pylint: enable=unidiomatic-typecheck
-
         return new_updated_node
 
     def on_visit_attribute(self, node: libcst.CSTNode, attribute: str) -> None:
@@ -201,9 +459,9 @@ class _BatchedTransformer(libcst.CSTTransformer):
         return None
 
     def update_children_context(
-        self, context: libcst.codemod.CodemodContext
+        self, context: libcst.codemod.CodemodContext, modified_flag: List[bool]
     ) -> None:
-        """Propagate the context of the codemod to all children.
+        """Propagate the context and modified flag of the codemod to children.
 
         There is some sort of a hack in the LibCST CLI interfaces which change
         the context of an existing codemod, but that does not get propagated all
@@ -212,3 +470,4 @@ class _BatchedTransformer(libcst.CSTTransformer):
         for methods in self.leave_methods.values():
             for method in methods:
                 method.__self__.context = context
+                method.__self__.modified_flag = modified_flag
@@ -1,7 +1,7 @@
-import configparser
 import dataclasses
+import os
 import pathlib
-from typing import List, Optional, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 # The maximum number of directories to be searched for the config file
 _MAX_SEARCH_DEPTH: int = 25
@@ -36,15 +36,19 @@ def find_path(
     home = pathlib.Path.home()
     path = start_path.resolve()
     for path in [path, *path.parents][:_MAX_SEARCH_DEPTH]:
-        config_file = path / CONFIG_FILENAME
-        if config_file.is_file():
-            return config_file
-
-        for stop_dir in _STOP_SEARCH_ON_DIRS:
-            if (path / stop_dir).is_dir():
-                return None
-
-        if path == home:
+        # A single scan per directory, instead of checking each candidate.
+        # The config file has precedence over a stop directory.
+        stop = False
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name == CONFIG_FILENAME and entry.is_file():
+                        return path / CONFIG_FILENAME
+                    if entry.name in _STOP_SEARCH_ON_DIRS and entry.is_dir():
+                        stop = True
+        except OSError:
+            pass
+        if stop or path == home:
             return None
 
     return None
@@ -61,13 +65,12 @@ def load(path: Optional[pathlib.Path]) -> Config:
     if not path:
         return Config(path=None)
 
-    config = configparser.ConfigParser()
     try:
-        config.read(path)
-    except configparser.Error as e:
+        sections = _parse_ini(path.read_text())
+    except (OSError, ValueError) as e:
         raise InvalidConfigError(f"{path} is not a valid config file") from e
     try:
-        craftier_config = config["craftier"]
+        craftier_config = sections["craftier"]
     except KeyError as e:
         raise InvalidConfigError("missing [craftier] section") from e
 
@@ -80,3 +83,39 @@ def load(path: Optional[pathlib.Path]) -> Config:
 
 def _parse_list(value: str) -> List[str]:
     return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def _parse_ini(content: str) -> Dict[str, Dict[str, str]]:
+    """Parse the subset of the ini format used by craftier's config.
+
+    It supports comments, continuation lines and both `=` and `:` as
+    separators, like configparser does, without paying for its import.
+    """
+    sections: Dict[str, Dict[str, str]] = {}
+    section: Optional[Dict[str, str]] = None
+    key: Optional[str] = None
+    for lineno, line in enumerate(content.splitlines(), start=1):
+        stripped = line.strip()
+        if not stripped or stripped[0] in "#;":
+            continue
+        if line[0].isspace() and section is not None and key is not None:
+            section[key] += "\n" + stripped
+            continue
+        if stripped[0] == "[" and stripped[-1] == "]":
+            name = stripped[1:-1]
+            if name in sections:
+                raise ValueError(f"line {lineno}: duplicate section {name}")
+            section = sections[name] = {}
+            key = None
+            continue
+        separator = min(
+            (i for i in (stripped.find("="), stripped.find(":")) if i > 0),
+            default=-1,
+        )
+        if section is None or separator == -1:
+            raise ValueError(f"line {lineno}: invalid line {stripped!r}")
+        key = stripped[:separator].strip().lower()
+        if key in section:
+            raise ValueError(f"line {lineno}: duplicate option {key}")
+        section[key] = stripped[separator + 1 :].strip()
+    return sections
@@ -1,9 +1,51 @@
+import collections
+import os
 import pathlib
-from typing import Iterable, Sequence
+from typing import Dict, Iterable, List, Sequence
+
+# Only on Windows do scandir entries carry the stat information. Elsewhere
+# DirEntry.stat() makes a system call per entry, so listing the directories
+# would only add work.
+_SCANDIR_CACHES_STAT = os.name == "nt"
 
 
 def get_modified_files(
     files: Iterable[pathlib.Path], *, since: float
 ) -> Sequence[pathlib.Path]:
     """Return the files that were modified since the given timestamp."""
-    return [f for f in files if f.stat().st_mtime > since]
+    if not _SCANDIR_CACHES_STAT:
+        return [f for f in files if f.stat().st_mtime > since]
+
+    files = list(files)
+    by_parent: Dict[pathlib.Path, List[pathlib.Path]] = collections.defaultdict(
+        list
+    )
+    for f in files:
+        by_parent[f.parent].append(f)
+
+    mtimes: Dict[pathlib.Path, float] = {}
+    for parent, children in by_parent.items():
+        mtimes.update(_get_mtimes(parent, children))
+    return [f for f in files if mtimes[f] > since]
+
+
+def _get_mtimes(
+    parent: pathlib.Path, files: Sequence[pathlib.Path]
+) -> Dict[pathlib.Path, float]:
+    """Return the mtime of the files, scanning their parent only once."""
+    if len(files) == 1:
+        return {files[0]: files[0].stat().st_mtime}
+    names = {f.name for f in files}
+    try:
+        with os.scandir(parent) as entries:
+            by_name = {
+                entry.name: entry.stat().st_mtime
+                for entry in entries
+                if entry.name in names
+            }
+    except OSError:
+        by_name = {}
+    return {
+        f: by_name[f.name] if f.name in by_name else f.stat().st_mtime
+        for f in files
+    }
@@ -1,6 +1,8 @@
+import functools
 import inspect
 import textwrap
-from typing import Any, Callable, Dict, Sequence
+import types
+from typing import Any, Callable, Dict, Mapping, Sequence, Set
 
 import libcst
 import libcst.matchers
@@ -12,12 +14,21 @@ from craftier import libcst_typing
 
 def args_to_matchers(
     function: Callable[..., Any],
-) -> Dict[str, libcst_typing.Matcher]:
+) -> Mapping[str, libcst_typing.Matcher]:
     """Extract node matchers from the function arguments.
 
     Untyped arguments will get a `DoNotCare` matcher, while arguments typed and
     annoated with a `BaseMatcherNode` will return that matcher.
+
+    The result is cached per function, so it must not be modified.
     """
+    return _args_to_matchers(_unbound(function))
+
+
+@functools.lru_cache(maxsize=None)
+def _args_to_matchers(
+    function: Callable[..., Any],
+) -> Mapping[str, libcst_typing.Matcher]:
     matchers: Dict[str, libcst_typing.Matcher] = {}
 
     # Create default matchers for all arguments
@@ -28,10 +39,16 @@ def args_to_matchers(
                 continue
             matchers[name] = libcst.matchers.DoNotCare()
 
+    # Evaluating the annotations is expensive, so we only do it when some of
+    # them are strings, e.g. when using `from __future__ import annotations`.
+    annotations = function.__annotations__
+    if any(isinstance(value, str) for value in annotations.values()):
+        annotations = typing_extensions.get_type_hints(
+            function, include_extras=True
+        )
+
     # Check if any of the arguments was annotated with a Matcher
-    for name, type_declaration in typing_extensions.get_type_hints(
-        function, include_extras=True
-    ).items():
+    for name, type_declaration in annotations.items():
         if typing_extensions.get_origin(type_declaration) is Annotated:
             # Check if there is a matcher
             arg = typing_extensions.get_args(type_declaration)[1]
@@ -61,6 +78,17 @@ class UnusedArgument(Exception):
         self.lineno = lineno
 
 
+class _NameCollector(libcst.CSTVisitor):
+    """Collect the values of all the names in a tree."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.names: Set[str] = set()
+
+    def visit_Name(self, node: libcst.Name) -> None:
+        self.names.add(node.value)
+
+
 def _remove_expression(node: libcst.CSTNode) -> libcst.CSTNode:
     if isinstance(node, libcst.Expr):
         return node.value
@@ -83,7 +111,6 @@ def _from_body(body: Sequence[libcst.CSTNode]) -> Sequence[libcst.CSTNode]:
 def _from_function_source(
     source: str, function: Callable[..., Any]
 ) -> Sequence[libcst.CSTNode]:
-    source = textwrap.dedent(source)
     tree = libcst.parse_statement(source)
     function_node = libcst.ensure_type(tree, libcst.FunctionDef)
     body = function_node.body.body
@@ -92,12 +119,12 @@ def _from_function_source(
 
     args = function.__code__.co_varnames[: function.__code__.co_argcount]
     if args:
+        collector = _NameCollector()
+        function_node.body.visit(collector)
         for name in args:
             if name == "self":
                 continue
-            if not libcst.matchers.findall(
-                function_node.body, libcst.matchers.Name(value=name)
-            ):
+            if name not in collector.names:
                 raise UnusedArgument(
                     name, function.__name__, function.__code__.co_firstlineno
                 )
@@ -106,5 +133,26 @@ def _from_function_source(
 
 
 def parse(function: Callable[..., Any]) -> Sequence[libcst.CSTNode]:
-    """Extract a `CSTNode` from a function's source code."""
-    return _from_function_source(inspect.getsource(function), function)
+    """Extract a `CSTNode` from a function's source code.
+
+    The result is cached per function, so it must not be modified.
+    """
+    return _parse(_unbound(function))
+
+
+@functools.lru_cache(maxsize=None)
+def _parse(function: Callable[..., Any]) -> Sequence[libcst.CSTNode]:
+    return _from_function_source(_get_source(function.__code__), function)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_source(code: types.CodeType) -> str:
+    # Code objects are shared by all the functions created from the same
+    # definition, e.g. nested functions, so this also caches their source.
+    return textwrap.dedent(inspect.getsource(code))
+
+
+def _unbound(function: Callable[..., Any]) -> Callable[..., Any]:
+    # Bound methods are created on every attribute access, so we cache the
+    # underlying function instead. This also avoids keeping the instance alive.
+    return getattr(function, "__func__", function)
@@ -1,7 +1,9 @@
-from typing import Union
+from typing import Any, Union
 
 import libcst.matchers
 
 Matcher = Union[
-    libcst.matchers.BaseMatcherNode, libcst.matchers.DoNotCareSentinel
+    libcst.matchers.BaseMatcherNode,
+    libcst.matchers.DoNotCareSentinel,
+    libcst.matchers.MatchIfTrue[Any],
 ]
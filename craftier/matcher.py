@@ -1,11 +1,24 @@
 import ast
 import dataclasses
-from typing import Any, Callable, Dict, List, Sequence, Tuple, Union, cast
+import functools
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 import libcst
 import libcst.matchers
 
-from craftier import libcst_typing
+from craftier import libcst_typing, utils
 
 # TODO: have a custom extension of OneOf and MatchIfTrue, so that we can know
 # which classes to match on.
@@ -31,7 +44,6 @@ from craftier import libcst_typing
 # TODO: assign should match annassign
 
 
-@dataclasses.dataclass
 class _Placeholder:
     """Helper class used to keep track how many matchers are in use.
 
@@ -44,8 +56,14 @@ class _Placeholder:
     instances of x/0, x/1, etc. are equivalent.
     """
 
-    matcher: libcst_typing.Matcher
-    total: int = 0
+    # Instances are created for every placeholder of every pattern, and are
+    # accessed on each match, so they avoid the overhead of a __dict__. Python
+    # 3.7 dataclasses do not support slots, hence the manual implementation.
+    __slots__ = ("matcher", "total")
+
+    def __init__(self, matcher: libcst_typing.Matcher, total: int = 0) -> None:
+        self.matcher = matcher
+        self.total = total
 
 
 _SKIP_FIELDS = frozenset(
@@ -64,13 +82,39 @@ _SKIP_FIELDS = frozenset(
 )
 
 
+# Removes the f-string prefix, keeping the other prefixes, like r or b.
+_FSTRING_PREFIX_STRIP = str.maketrans("", "", "fF")
+
+
 def _skip_field(name: str) -> bool:
     if name in _SKIP_FIELDS:
         return True
     return "whitespace" in name or name.startswith("_")
 
 
+@functools.lru_cache(maxsize=None)
+def _matcher_fields(
+    node_class: Type[libcst.CSTNode],
+) -> Tuple[Callable[..., libcst.matchers.BaseMatcherNode], Tuple[str, ...]]:
+    """Return the matcher class and the fields to match of a node class."""
+    fields = tuple(
+        f.name
+        for f in dataclasses.fields(node_class)
+        if not _skip_field(f.name)
+    )
+    return getattr(libcst.matchers, node_class.__name__), fields
+
+
+_SINGLE_QUOTE_ESCAPE = str.maketrans(
+    {"\\": "\\\\", "'": "\\'", "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+)
+
+
 def _repr_single(string: str) -> str:
+    escaped = string.translate(_SINGLE_QUOTE_ESCAPE)
+    if escaped.isprintable():
+        return f"'{escaped}'"
+    # Other non printable characters need repr's escaping.
     # See https://stackoverflow.com/questions/27402168/force-repr-to-use-single-quotes
     return "'" + repr('"' + string)[2:]
 
@@ -78,10 +122,13 @@ def _repr_single(string: str) -> str:
 def _make_literal_value_matcher(
     node_value: str,
 ) -> libcst.matchers.MatchIfTrue[Callable[[str], bool]]:
-    expected_value = ast.literal_eval(node_value)
+    expected_value = utils.literal_eval(node_value)
 
     def comparator(value: str) -> bool:
-        return cast(bool, ast.literal_eval(value) == expected_value)
+        # Identical literals are common and cheap to check.
+        if value == node_value:
+            return True
+        return cast(bool, utils.literal_eval(value) == expected_value)
 
     return libcst.matchers.MatchIfTrue(comparator)
 
@@ -114,20 +161,21 @@ def _formatted_string_parts(
 ) -> Tuple[Sequence[str], Sequence[libcst.FormattedStringExpression]]:
     texts = []
     expressions = []
-    prefix = node.start.replace("f", "").replace("F", "")
+    prefix = node.start.translate(_FSTRING_PREFIX_STRIP)
     for part in node.parts:
         if isinstance(part, libcst.FormattedStringText):
             texts.append(
-                cast(str, ast.literal_eval(f"{prefix}{part.value}{node.end}"))
+                cast(str, utils.literal_eval(f"{prefix}{part.value}{node.end}"))
             )
         elif isinstance(part, libcst.FormattedStringExpression):
             expressions.append(part)
-    return texts, expressions
+    # The parts are never modified, and tuples are cheaper to compare.
+    return tuple(texts), tuple(expressions)
 
 
 def _make_formatted_string_matcher(
     original_node: libcst.FormattedString, placeholders: Dict[str, _Placeholder]
-) -> libcst.matchers.BaseMatcherNode:
+) -> libcst.matchers.MatchIfTrue[libcst.CSTNode]:
     original_texts, original_expressions = _formatted_string_parts(
         original_node
     )
@@ -152,27 +200,20 @@ def _make_formatted_string_matcher(
             for e, matcher in zip(expressions, original_expressions_matchers)
         )
 
-    # We need to wrap it with OneOf, otherwise it won't match
-    return libcst.matchers.OneOf(
-        libcst.matchers.MatchIfTrue(formatted_condition)
-    )
+    return libcst.matchers.MatchIfTrue(formatted_condition)
 
 
 def _flatten_concatenated_string(
     node: libcst.ConcatenatedString,
 ) -> Union[libcst.SimpleString, libcst.FormattedString]:
-    classes = {type(node.left)}
     parts = []
     rest: Union[
         libcst.ConcatenatedString, libcst.SimpleString, libcst.FormattedString
     ] = node
     while isinstance(rest, libcst.ConcatenatedString):
         parts.append(rest.left)
-        classes.add(type(rest.left))
         rest = rest.right
     parts.append(rest)
-    classes.add(type(rest))
-    # print(parts)
 
     if all(isinstance(n, libcst.SimpleString) for n in parts):
         # There's no idiom other than casting to tell mypy the list only has one
@@ -182,74 +223,105 @@ def _flatten_concatenated_string(
         return libcst.SimpleString(value=repr(content))
 
     formatted_parts: List[libcst.BaseFormattedStringContent] = []
+    # Consecutive texts are buffered, so that a single node is built for them.
+    pending_texts: List[str] = []
+
+    def flush_texts() -> None:
+        if pending_texts:
+            formatted_parts.append(
+                libcst.FormattedStringText(value="".join(pending_texts))
+            )
+            pending_texts.clear()
+
     for part in parts:
         if isinstance(part, libcst.SimpleString):
-            value = _repr_single(part.evaluated_value)[1:-1]
-            if formatted_parts and isinstance(
-                formatted_parts[-1], libcst.FormattedStringText
-            ):
-                formatted_parts[-1] = libcst.FormattedStringText(
-                    value=formatted_parts[-1].value + value
-                )
-            else:
-                formatted_parts.append(libcst.FormattedStringText(value=value))
+            pending_texts.append(_repr_single(part.evaluated_value)[1:-1])
         else:
+            prefix = part.start.translate(_FSTRING_PREFIX_STRIP)
             for nested_part in part.parts:
-                prefix = part.start.replace("f", "").replace("F", "")
                 if isinstance(nested_part, libcst.FormattedStringText):
-                    value = _repr_single(
-                        ast.literal_eval(
-                            f"{prefix}{nested_part.value}{part.end}"
-                        )
-                    )[1:-1]
-                    if formatted_parts and isinstance(
-                        formatted_parts[-1], libcst.FormattedStringText
-                    ):
-                        formatted_parts[-1] = libcst.FormattedStringText(
-                            value=formatted_parts[-1].value + value
-                        )
-                    else:
-                        formatted_parts.append(
-                            libcst.FormattedStringText(value=value)
-                        )
+                    pending_texts.append(
+                        _repr_single(
+                            ast.literal_eval(
+                                f"{prefix}{nested_part.value}{part.end}"
+                            )
+                        )[1:-1]
+                    )
                 else:
+                    flush_texts()
                     formatted_parts.append(nested_part)
+    flush_texts()
     return libcst.FormattedString(parts=formatted_parts, start="f'", end="'")
 
 
-def _to_matcher(
-    node: libcst.CSTNode, placeholders: Dict[str, _Placeholder]
+def _name_matcher(
+    node: libcst.Name, placeholders: Dict[str, _Placeholder]
+) -> Optional[libcst_typing.Matcher]:
+    placeholder = placeholders.get(node.value)
+    if placeholder is None:
+        return None
+    placeholder.total += 1
+    return libcst.matchers.SaveMatchedNode(
+        placeholder.matcher, f"{node.value}/{placeholder.total}"
+    )
+
+
+def _number_matcher(
+    node: Union[libcst.Integer, libcst.Float, libcst.Imaginary],
+    _placeholders: Dict[str, _Placeholder],
 ) -> libcst_typing.Matcher:
-    if isinstance(node, libcst.Name) and node.value in placeholders:
-        placeholder = placeholders[node.value]
-        placeholder.total += 1
-        return libcst.matchers.SaveMatchedNode(
-            placeholder.matcher, f"{node.value}/{placeholder.total}"
-        )
+    matcher_class, _ = _matcher_fields(node.__class__)
+    return matcher_class(value=_make_literal_value_matcher(node.value))
+
+
+def _concatenated_string_matcher(
+    node: libcst.ConcatenatedString, placeholders: Dict[str, _Placeholder]
+) -> libcst_typing.Matcher:
+    return _to_matcher(_flatten_concatenated_string(node), placeholders)
+
+
+def _simple_string_matcher(
+    node: libcst.SimpleString, _placeholders: Dict[str, _Placeholder]
+) -> libcst_typing.Matcher:
+    return _make_simple_string_matcher(node)
 
-    if isinstance(node, (libcst.Integer, libcst.Float, libcst.Imaginary)):
-        return cast(
-            libcst.matchers.BaseMatcherNode,
-            getattr(libcst.matchers, node.__class__.__name__)(
-                value=_make_literal_value_matcher(node.value)
-            ),
-        )
 
-    if isinstance(node, libcst.ConcatenatedString):
-        node = _flatten_concatenated_string(node)
+# Nodes with special matchers, keyed by their exact class. A handler returning
+# None falls back to the generic matcher.
+_MATCHER_HANDLERS: Mapping[
+    Type[libcst.CSTNode],
+    Callable[[Any, Dict[str, _Placeholder]], Optional[libcst_typing.Matcher]],
+] = {
+    libcst.Name: _name_matcher,
+    libcst.Integer: _number_matcher,
+    libcst.Float: _number_matcher,
+    libcst.Imaginary: _number_matcher,
+    libcst.ConcatenatedString: _concatenated_string_matcher,
+    libcst.SimpleString: _simple_string_matcher,
+    libcst.FormattedString: _make_formatted_string_matcher,
+}
 
-    if isinstance(node, libcst.SimpleString):
-        return _make_simple_string_matcher(node)
 
-    if isinstance(node, libcst.FormattedString):
-        return _make_formatted_string_matcher(node, placeholders)
+def _to_matcher(
+    node: libcst.CSTNode, placeholders: Dict[str, _Placeholder]
+) -> libcst_typing.Matcher:
+    handler = _MATCHER_HANDLERS.get(node.__class__)
+    if handler is not None:
+        special_matcher = handler(node, placeholders)
+        if special_matcher is not None:
+            return special_matcher
+    return _to_matcher_generic(node, placeholders)
 
-    fields = [f for f in dataclasses.fields(node) if not _skip_field(f.name)]
+
+def _to_matcher_generic(
+    node: libcst.CSTNode, placeholders: Dict[str, _Placeholder]
+) -> libcst.matchers.BaseMatcherNode:
+    """Build the matcher of a node from the matchers of its fields."""
+    matcher_class, fields = _matcher_fields(node.__class__)
 
     data: Dict[str, Any] = {}
     matcher: Any
-    for f in fields:
-        key = f.name
+    for key in fields:
         value = getattr(node, key)
         # print(key, value, type(value))
         # if value == []:
@@ -263,22 +335,18 @@ def _to_matcher(
                 matcher = [_to_matcher(n, placeholders) for n in value]
             else:
                 matcher = value
-        elif value == libcst.MaybeSentinel.DEFAULT:
+        elif value is libcst.MaybeSentinel.DEFAULT:
             matcher = libcst.matchers.DoNotCare()
         else:
             matcher = value
         # if key == 'operator':
         #    print(matcher, type(matcher))
         data[key] = matcher
-    # print('matcher class', getattr(m, node.__class__.__name__))
-    return cast(
-        libcst.matchers.BaseMatcherNode,
-        getattr(libcst.matchers, node.__class__.__name__)(**data),
-    )
+    return matcher_class(**data)
 
 
 def from_node(
-    node: libcst.CSTNode, placeholders: Dict[str, libcst_typing.Matcher]
+    node: libcst.CSTNode, placeholders: Mapping[str, libcst_typing.Matcher]
 ) -> libcst_typing.Matcher:
     """Return a matcher that matches the given node.
 
@@ -309,8 +377,11 @@ def matches(node: libcst.CSTNode, matcher: libcst_typing.Matcher) -> bool:
     """Return True if the node matches the shape defined by the matcher.
 
     This is a replacement for libcst.matchers.matches accepting a
-    DoNotCareSentinel.
+    DoNotCareSentinel and a MatchIfTrue.
     """
-    if isinstance(matcher, libcst.matchers.DoNotCareSentinel):
+    # DoNotCareSentinel has a single member, so an identity check is enough.
+    if matcher is libcst.matchers.DoNotCareSentinel.DEFAULT:
         return True
+    if isinstance(matcher, libcst.matchers.MatchIfTrue):
+        return bool(matcher.func(node))
     return libcst.matchers.matches(node, matcher)
@@ -1,9 +1,10 @@
-import ast
 from typing import Any, Callable, cast
 
 import libcst.matchers
 from typing_extensions import Annotated
 
+from craftier import utils
+
 _BUILTINS = frozenset(
     (
         "abs",
@@ -82,17 +83,12 @@ _BUILTINS = frozenset(
     )
 )
 
-
-def _is_builtin(value: str) -> bool:
-    return value in _BUILTINS
-
-
 _BOOLEAN_VALUES = frozenset(("True", "False"))
 
-
-def _is_boolean(value: str) -> bool:
-    return value in _BOOLEAN_VALUES
-
+# The predicates are the bound __contains__ of the sets, so that they are
+# evaluated in C without the overhead of a Python function call.
+_is_builtin = _BUILTINS.__contains__
+_is_boolean = _BOOLEAN_VALUES.__contains__
 
 Builtin = Annotated[
     Any, libcst.matchers.Name(value=libcst.matchers.MatchIfTrue(_is_builtin))
@@ -109,10 +105,12 @@ NoneLiteral = Annotated[None, libcst.matchers.Name(value="None")]
 def _match_if_equal(
     node_value: str,
 ) -> libcst.matchers.MatchIfTrue[Callable[[str], bool]]:
-    expected_value = ast.literal_eval(node_value)
+    expected_value = utils.literal_eval(node_value)
 
     def comparator(value: str) -> bool:
-        return cast(bool, ast.literal_eval(value) == expected_value)
+        if value == node_value:
+            return True
+        return cast(bool, utils.literal_eval(value) == expected_value)
 
     return libcst.matchers.MatchIfTrue(comparator)
 
@@ -120,10 +118,12 @@ def _match_if_equal(
 def _match_if_distinct(
     node_value: str,
 ) -> libcst.matchers.MatchIfTrue[Callable[[str], bool]]:
-    expected_value = ast.literal_eval(node_value)
+    expected_value = utils.literal_eval(node_value)
 
     def comparator(value: str) -> bool:
-        return cast(bool, ast.literal_eval(value) != expected_value)
+        if value == node_value:
+            return False
+        return cast(bool, utils.literal_eval(value) != expected_value)
 
     return libcst.matchers.MatchIfTrue(comparator)
 
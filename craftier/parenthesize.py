@@ -1,69 +1,76 @@
-from typing import TypeVar
+from typing import Mapping, Type, TypeVar
 
 import libcst
 
+# See https://docs.python.org/3/reference/expressions.html for details.
+_BINARY_OPERATION_PRECEDENCE: Mapping[Type[libcst.CSTNode], int] = {
+    libcst.BitOr: 8,
+    libcst.BitXor: 9,
+    libcst.BitAnd: 10,
+    libcst.LeftShift: 11,
+    libcst.RightShift: 11,
+    libcst.Add: 12,
+    libcst.Subtract: 12,
+    libcst.Multiply: 13,
+    libcst.MatrixMultiply: 13,
+    libcst.Divide: 13,
+    libcst.FloorDivide: 13,
+    libcst.Modulo: 13,
+    libcst.Power: 15,
+}
+
+_BOOLEAN_OPERATION_PRECEDENCE: Mapping[Type[libcst.CSTNode], int] = {
+    libcst.Or: 4,
+    libcst.And: 5,
+}
+
+_UNARY_OPERATION_PRECEDENCE: Mapping[Type[libcst.CSTNode], int] = {
+    libcst.Not: 6,
+    libcst.BitInvert: 14,
+    libcst.Minus: 14,
+    libcst.Plus: 14,
+}
+
+# Nodes whose precedence depends on their operator.
+_OPERATOR_PRECEDENCE: Mapping[
+    Type[libcst.CSTNode], Mapping[Type[libcst.CSTNode], int]
+] = {
+    libcst.BinaryOperation: _BINARY_OPERATION_PRECEDENCE,
+    libcst.BooleanOperation: _BOOLEAN_OPERATION_PRECEDENCE,
+    libcst.UnaryOperation: _UNARY_OPERATION_PRECEDENCE,
+}
+
+_PRECEDENCE: Mapping[Type[libcst.CSTNode], int] = {
+    libcst.NamedExpr: 1,
+    libcst.Lambda: 2,
+    libcst.IfExp: 3,
+    libcst.Comparison: 7,
+    libcst.Await: 16,
+    libcst.Subscript: 17,
+    libcst.Call: 17,
+    libcst.Attribute: 17,
+    libcst.Tuple: 18,
+    libcst.List: 18,
+    libcst.ListComp: 18,
+    libcst.Dict: 18,
+    libcst.DictComp: 18,
+    libcst.Set: 18,
+    libcst.SetComp: 18,
+    libcst.GeneratorExp: 100,
+}
+
 
 def _precedence(node: libcst.CSTNode) -> int:
     """
     Return the precedence of a given expression.
 
     Nodes which are not expression have the maximum precedence.
-
-    See https://docs.python.org/3/reference/expressions.html for details.
     """
-    if isinstance(node, libcst.BinaryOperation):
-        binary_operation_precedence = {
-            libcst.BitOr: 8,
-            libcst.BitXor: 9,
-            libcst.BitAnd: 10,
-            libcst.LeftShift: 11,
-            libcst.RightShift: 11,
-            libcst.Add: 12,
-            libcst.Subtract: 12,
-            libcst.Multiply: 13,
-            libcst.MatrixMultiply: 13,
-            libcst.Divide: 13,
-            libcst.FloorDivide: 13,
-            libcst.Modulo: 13,
-            libcst.Power: 15,
-        }
-        return binary_operation_precedence[type(node.operator)]
-
-    if isinstance(node, libcst.BooleanOperation):
-        boolean_operation_precedence = {
-            libcst.Or: 4,
-            libcst.And: 5,
-        }
-        return boolean_operation_precedence[type(node.operator)]
-
-    if isinstance(node, libcst.UnaryOperation):
-        unary_operation_precedence = {
-            libcst.Not: 6,
-            libcst.BitInvert: 14,
-            libcst.Minus: 14,
-            libcst.Plus: 14,
-        }
-        return unary_operation_precedence[type(node.operator)]
-
-    precedence = {
-        libcst.NamedExpr: 1,
-        libcst.Lambda: 2,
-        libcst.IfExp: 3,
-        libcst.Comparison: 7,
-        libcst.Await: 16,
-        libcst.Subscript: 17,
-        libcst.Call: 17,
-        libcst.Attribute: 17,
-        libcst.Tuple: 18,
-        libcst.List: 18,
-        libcst.ListComp: 18,
-        libcst.Dict: 18,
-        libcst.DictComp: 18,
-        libcst.Set: 18,
-        libcst.SetComp: 18,
-        libcst.GeneratorExp: 100,
-    }
-    return precedence.get(type(node), 100)
+    node_class = type(node)
+    operator_precedence = _OPERATOR_PRECEDENCE.get(node_class)
+    if operator_precedence is not None:
+        return operator_precedence[type(getattr(node, "operator"))]
+    return _PRECEDENCE.get(node_class, 100)
 
 
 def _needs_parentheses_parent(
@@ -5,20 +5,27 @@ Note: because this uses a global state it will only work in forked
 multi-process. Note that the default changed in Python 38 for MacOs.
 """
 
-import dataclasses
 import json
 import multiprocessing
+import os
 import tempfile
-from typing import IO, Any, Dict, Mapping, Optional, Sequence
+from typing import IO, Any, ContextManager, Dict, Iterator, Mapping, Optional
 
 
-@dataclasses.dataclass
 class _Config:
-    file: Optional[IO[bytes]] = None
+    __slots__ = ("file", "lock")
+
+    def __init__(self) -> None:
+        self.file: Optional[IO[bytes]] = None
+        # Created along with the file, so that forked processes share it.
+        self.lock: Optional[ContextManager[Any]] = None
 
 
 _config = _Config()
 
+# Maximum number of bytes read at once while holding the lock.
+_READ_CHUNK_SIZE = 64 * 1024
+
 
 class PerformanceError(Exception):
     """Errors specific to the performance module."""
@@ -31,6 +38,12 @@ def enable() -> None:
     _config.file = tempfile.NamedTemporaryFile(
         prefix="craftier-stats-", buffering=0
     )
+    _config.lock = multiprocessing.Lock()
+
+
+def is_enabled() -> bool:
+    """Return whether the performance sink is enabled."""
+    return _config.file is not None
 
 
 def write(data: Dict[str, Any]) -> None:
@@ -38,20 +51,36 @@ def write(data: Dict[str, Any]) -> None:
 
     Data must be a JSON serializable object.
     """
-    if not _config.file:
+    if not _config.file or not _config.lock:
         return
-    with multiprocessing.Lock():
-        _config.file.write(json.dumps(data).encode())
-        _config.file.write(b"\n")
+    # A single write per entry, so that entries are not split.
+    line = json.dumps(data).encode() + b"\n"
+    with _config.lock:
+        _config.file.write(line)
 
 
-def read() -> Sequence[Mapping[str, Any]]:
-    """Read the contents of the performance data."""
-    if not _config.file:
-        return []
-    with multiprocessing.Lock():
-        _config.file.seek(0)
-        return [json.loads(line.strip().decode()) for line in _config.file]
+def read() -> Iterator[Mapping[str, Any]]:
+    """Read the contents of the performance data.
+
+    Entries are streamed in chunks of about _READ_CHUNK_SIZE bytes. The lock is
+    only held while reading each chunk, so that writing while iterating does not
+    deadlock. Entries written during the iteration are returned as well.
+    """
+    offset = 0
+    while _config.file and _config.lock:
+        with _config.lock:
+            _config.file.seek(offset)
+            chunk = _config.file.read(_READ_CHUNK_SIZE)
+            if chunk and not chunk.endswith(b"\n"):
+                # Entries are written whole, so the last one can be completed.
+                chunk += _config.file.readline()
+            offset = _config.file.tell()
+            # Further writes must append.
+            _config.file.seek(0, os.SEEK_END)
+        if not chunk:
+            return
+        for line in chunk.splitlines():
+            yield json.loads(line)
 
 
 def disable() -> None:
@@ -63,3 +92,4 @@ def disable() -> None:
         raise PerformanceError("performance is not enabled")
     _config.file.close()
     _config.file = None
+    _config.lock = None
@@ -1,12 +1,16 @@
+import collections
+import concurrent.futures
 import contextlib
 import dataclasses
 import io
+import multiprocessing
 import os
 import pathlib
 import platform
 import sys
 import time
-from typing import Any, Sequence, Type
+import traceback
+from typing import Any, Counter, Iterable, Optional, Sequence, Type
 
 import libcst
 import libcst.codemod
@@ -18,6 +22,9 @@ from craftier import fs
 
 _LIBCST_SINK = io.StringIO()
 
+# Up to this number of files, they are refactored in the current process.
+_SEQUENTIAL_THRESHOLD = 4
+
 
 class Error(Exception):
     """Base class for refactoring errors."""
@@ -70,12 +77,9 @@ def run(
         lambda: ", ".join(_full_name(t) for t in transformers),
     )
 
-    transform = codemod.BatchedCodemod(
-        libcst.codemod.CodemodContext(), transformers
-    )
     python_files = [str(p) for p in files]
     now = time.time()
-    result = _exec_transform(transform, python_files)
+    result = _exec_transform(transformers, python_files)
 
     modified = fs.get_modified_files(files, since=now)
 
@@ -123,49 +127,104 @@ def _is_windows() -> bool:
     return system == "Windows" or system.startswith("CYGWIN_NT")
 
 
-def _sequential_exec_transform_with_prettyprint(
-    transform: libcst.codemod.Codemod,
-    python_files: Sequence[str],
-    *,
-    include_generated: bool = True,
-) -> libcst.codemod.ParallelTransformResult:
-    """Run a transform sequentially in the same process.
+@dataclasses.dataclass
+class _Worker:
+    """State of a worker process, initialized once by `_worker_init`."""
 
-    This wrapper is similar in API to parallel_exec_transform_with_prettyprint
-    and it is used when running the code on Windows or under a profiler.
-    """
-    for file in python_files:
-        transform.context = dataclasses.replace(
-            transform.context, filename=file
-        )
-        with open(file) as f:
-            libcst.codemod.exec_transform_with_prettyprint(
-                transform, f.read(), include_generated=include_generated
-            )
+    transform: Optional[libcst.codemod.Codemod] = None
 
-    return libcst.codemod.ParallelTransformResult(
-        successes=0, failures=0, skips=0, warnings=0
+
+_worker = _Worker()
+
+
+@dataclasses.dataclass(frozen=True)
+class _FileResult:
+    """Outcome of refactoring a single file, sent back by the workers."""
+
+    filename: str
+    status: str
+    error: Optional[str] = None
+
+
+def _worker_init(
+    transformers: Sequence[Type[codemod.ContextAwareTransformer]],
+) -> None:
+    """Build the codemod once per worker, so it is reused across files."""
+    _worker.transform = codemod.BatchedCodemod(
+        libcst.codemod.CodemodContext(), transformers
     )
 
 
+def _process_file(filename: str) -> _FileResult:
+    """Refactor the file in place with the codemod of the current worker."""
+    transform = _worker.transform
+    if not transform:
+        raise Error("worker was not initialized")
+    transform.context = dataclasses.replace(
+        transform.context, filename=filename
+    )
+    try:
+        with open(filename, "rb") as f:
+            old_code = f.read()
+        new_code = transform.transform_module(
+            libcst.parse_module(old_code)
+        ).bytes
+    except libcst.codemod.SkipFile:
+        return _FileResult(filename, "skip")
+    except Exception:  # pylint: disable=broad-except
+        return _FileResult(filename, "failure", traceback.format_exc())
+
+    if new_code != old_code:
+        with open(filename, "wb") as f:
+            f.write(new_code)
+    return _FileResult(filename, "success")
+
+
 def _exec_transform(
-    transform: libcst.codemod.Codemod, files: Sequence[str]
+    transformers: Sequence[Type[codemod.ContextAwareTransformer]],
+    files: Sequence[str],
 ) -> libcst.codemod.ParallelTransformResult:
-    if _is_profiling() or _is_windows():
-        return _sequential_exec_transform_with_prettyprint(
-            transform, files, include_generated=True
-        )
+    with contextlib.redirect_stderr(_LIBCST_SINK):
+        cpu_count = os.cpu_count() or 1
+        jobs = max(1, min(cpu_count, len(files)))
+        # Run in the same process when on Windows or under a profiler, and
+        # when there are too few files to pay off the start up of the pool.
+        if (
+            jobs == 1
+            or len(files) <= _SEQUENTIAL_THRESHOLD
+            or _is_profiling()
+            or _is_windows()
+        ):
+            _worker_init(transformers)
+            return _summarize(map(_process_file, files))
+
+        chunksize = max(1, len(files) // (cpu_count * 4))
+        # Workers are forked, so that they inherit the state of this process,
+        # like the performance sink, and the initializer only builds the
+        # transformers once per worker.
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_worker_init,
+            initargs=(transformers,),
+        ) as executor:
+            return _summarize(
+                executor.map(_process_file, files, chunksize=chunksize)
+            )
 
-    chunksize = 4
-    jobs = min(
-        os.cpu_count() or 1,
-        (len(files) + chunksize - 1) // chunksize,
+
+def _summarize(
+    results: Iterable[_FileResult],
+) -> libcst.codemod.ParallelTransformResult:
+    counts: Counter[str] = collections.Counter()
+    for result in results:
+        counts[result.status] += 1
+        if result.error:
+            print(f"Failed to refactor {result.filename}", file=sys.stderr)
+            print(result.error, file=sys.stderr)
+    return libcst.codemod.ParallelTransformResult(
+        successes=counts["success"],
+        failures=counts["failure"],
+        skips=counts["skip"],
+        warnings=0,
     )
-    with contextlib.redirect_stderr(_LIBCST_SINK):
-        return libcst.codemod.parallel_exec_transform_with_prettyprint(
-            transform,
-            files,
-            include_generated=True,
-            show_successes=False,
-            jobs=jobs,
-        )
@@ -1,8 +1,16 @@
 import dataclasses
-import itertools
 import time
-import types
-from typing import Any, Callable, Dict, Optional, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    cast,
+)
 
 import libcst
 import libcst.codemod
@@ -18,9 +26,18 @@ from craftier import codemod, function_parser, parenthesize, performance
 class ExpressionTransform:
     """Represent all the aspects of a code transform."""
 
+    # The transform is read on every visited node. Python 3.7 dataclasses do
+    # not support slots, but none of the fields has a default, so they can be
+    # declared by hand.
+    __slots__ = ("before", "after", "parents", "repeated_placeholders")
+
     before: libcst.matchers.BaseMatcherNode
     after: libcst.CSTNode
-    wrapper: libcst.metadata.MetadataWrapper
+    # The parent of each node in the after expression, resolved only once.
+    parents: Mapping[libcst.CSTNode, libcst.CSTNode]
+    # Whether a placeholder is used more than once in the before matcher, in
+    # which case its matches need to be checked for equivalence.
+    repeated_placeholders: bool
 
     def visitor_method_name(self) -> str:
         """Return the name of the vistior method that could match the matcher.
@@ -31,6 +48,20 @@ class ExpressionTransform:
         node_type = type(self.before).__name__
         return f"leave_{node_type}"
 
+    def operator_class(self) -> Optional[Type[libcst.CSTNode]]:
+        """Return the operator class required by the before matcher, if any.
+
+        For example if the before matcher was a `x + 2`, then the class returned
+        would be `libcst.Add`.
+        """
+        operator = getattr(self.before, "operator", None)
+        if not isinstance(operator, libcst.matchers.BaseMatcherNode):
+            return None
+        return cast(
+            Optional[Type[libcst.CSTNode]],
+            getattr(libcst, type(operator).__name__, None),
+        )
+
 
 def _get_expression_transform(
     before: Callable[..., Any], after: Callable[..., Any]
@@ -45,6 +76,13 @@ def _get_expression_transform(
         raise Exception(
             f"DoNotCare matcher is forbidden at top level in `{before.__name__}`"
         )
+    if isinstance(matcher, libcst.matchers.MatchIfTrue):
+        # Formatted strings are matched with a predicate, which cannot be
+        # dispatched to a leave method.
+        raise Exception(
+            "Formatted strings are not supported at top level in "
+            f"`{before.__name__}`"
+        )
 
     after_expression = function_parser.parse(after)[0]
     # Technically this is not correct as some expressions,like function calls,
@@ -60,11 +98,124 @@ def _get_expression_transform(
     body = cast(libcst.SimpleStatementLine, wrapper.module.body[0])
     replacement = body.body[0]
 
+    placeholder_names = [
+        name.value
+        for name in libcst.matchers.findall(expression, libcst.matchers.Name())
+        if isinstance(name, libcst.Name) and name.value in matchers
+    ]
+    unique_names = set(placeholder_names)
     return ExpressionTransform(
-        before=matcher, after=replacement, wrapper=wrapper
+        before=matcher,
+        after=replacement,
+        parents=wrapper.resolve(libcst.metadata.ParentNodeProvider),
+        repeated_placeholders=len(unique_names) != len(placeholder_names),
     )
 
 
+# The transform of each CraftierTransformer class, along with the name of its
+# methods. Matchers are expensive to build and they only depend on the class.
+_CLASS_TRANSFORMS: Dict[type, Tuple[str, ExpressionTransform]] = {}
+
+
+def _get_class_transform(cls: type) -> Tuple[str, ExpressionTransform]:
+    cached = _CLASS_TRANSFORMS.get(cls)
+    if cached is not None:
+        return cached
+    method_names = set()
+    for name in cls.__dict__:
+        if name.endswith("_before") or name.endswith("_after"):
+            method_names.add(name.rsplit("_", 1)[0])
+    if len(method_names) != 1:
+        raise Exception(
+            f"Only 1 method is supported at the moment. Found: {method_names}"
+        )
+    # TODO: handle more method definitions
+    name = list(method_names)[0]
+    before = getattr(cls, f"{name}_before", None)
+    after = getattr(cls, f"{name}_after", None)
+    if not before or not after:
+        raise Exception(
+            f"Expected `{name}_before` and `{name}_after` to be defined"
+        )
+    transform = _get_expression_transform(before, after)
+    leave_method = _make_leave_method(f"{cls.__name__}/{name}", transform)
+    setattr(cls, leave_method.__name__, leave_method)
+    cached = _CLASS_TRANSFORMS[cls] = (name, transform)
+    return cached
+
+
+def _make_leave_method(
+    perf_name: str, transform: ExpressionTransform
+) -> Callable[..., libcst.CSTNode]:
+    """Return the leave method applying the transform."""
+    operator_class = transform.operator_class()
+
+    # pylint: disable=unused-argument,protected-access
+    def custom_on_leave(
+        self: CraftierTransformer,
+        original_node: libcst.CSTNode,
+        updated_node: libcst.CSTNode,
+    ) -> libcst.CSTNode:
+        # Nodes with a different operator are rejected before extracting the
+        # matches, which walks the whole subtree. The batched codemod already
+        # filters them out, but not other users of the transformer.
+        if (
+            operator_class is not None
+            and getattr(updated_node, "operator").__class__
+            is not operator_class
+        ):
+            return updated_node
+        new_node = updated_node
+        status = "unchanged"
+        # Timing is skipped altogether when its data would be discarded.
+        timed = performance.is_enabled()
+        if timed:
+            start = time.perf_counter_ns()
+        # We don't support wildcard patterns yet, so we can safely cast the
+        # results to single nodes.
+        matches = cast(
+            Optional[Dict[str, libcst.CSTNode]],
+            libcst.matchers.extract(updated_node, transform.before),
+        )
+        if matches is not None:
+            if transform.repeated_placeholders:
+                actual_matches = check_matches(matches)
+            else:
+                actual_matches = _strip_occurrences(matches)
+            if actual_matches is not None:
+                # TODO: make sure all new nodes have a different id
+                new_node = _replace_names(
+                    transform.after, self._replacer, actual_matches
+                )
+                logger.debug(
+                    "{} changed file {}",
+                    perf_name,
+                    self.context.filename,
+                )
+                new_node = parenthesize.parenthesize_using_previous(
+                    new_node, updated_node
+                )
+                status = "modified"
+                self._mark_as_modified()
+        if timed:
+            end = time.perf_counter_ns()
+            performance.write(
+                {
+                    "name": perf_name,
+                    "time": (end - start) / 1e6,
+                    "status": status,
+                }
+            )
+        return new_node
+
+    # pylint: enable=unused-argument,protected-access
+
+    custom_on_leave.__name__ = transform.visitor_method_name()
+    if operator_class is not None:
+        codemod.for_operator(operator_class)(custom_on_leave)
+    return custom_on_leave
+
+
 def check_matches(
     matches: Dict[str, libcst.CSTNode]
 ) -> Optional[Dict[str, libcst.CSTNode]]:
@@ -78,29 +229,64 @@ def check_matches(
     TODO: instead of calling this method directly, we should incorporate it
     directly into the returned global matcher.
     """
+    grouped_matches: Dict[str, List[Tuple[str, libcst.CSTNode]]] = {}
+    for key, node in matches.items():
+        grouped_matches.setdefault(key.split("/", 1)[0], []).append((key, node))
     result = {}
-    for key, grouped_matches in itertools.groupby(
-        sorted(matches.items()), lambda x: x[0].split("/", 1)[0]
-    ):
-        first_match, *remaining_matches = grouped_matches
-        result[key] = first_match[1]
-        if not remaining_matches:
+    for name, group in grouped_matches.items():
+        if len(group) == 1:
+            result[name] = group[0][1]
             continue
-        matcher = craftier.matcher.from_node(first_match[1], {})
-        if not all(
-            craftier.matcher.matches(match[1], matcher)
+        # The first occurrence by name is the one used in the replacement.
+        group.sort(key=lambda match: match[0])
+        first_match, *remaining_matches = group
+        first_node = result[name] = first_match[1]
+        # Identical nodes are checked structurally first, as building a matcher
+        # is expensive. The matcher is still needed to ignore whitespace.
+        remaining_nodes = [
+            match[1]
             for match in remaining_matches
+            if not first_node.deep_equals(match[1])
+        ]
+        if not remaining_nodes:
+            continue
+        matcher = craftier.matcher.from_node(first_node, {})
+        if not all(
+            craftier.matcher.matches(node, matcher) for node in remaining_nodes
         ):
             return None
     return result
 
 
-class _ReplaceTransformer(libcst.CSTTransformer):
-    METADATA_DEPENDENCIES = (libcst.metadata.ParentNodeProvider,)
+def _strip_occurrences(
+    matches: Dict[str, libcst.CSTNode]
+) -> Dict[str, libcst.CSTNode]:
+    """Remove the occurrence from the names of the matches.
+
+    This is only valid when each placeholder has a single occurrence, as there
+    is nothing to check then.
+    """
+    return {key.split("/", 1)[0]: node for key, node in matches.items()}
 
-    def __init__(self, replacements: Dict[str, libcst.CSTNode]) -> None:
+
+_ATOM_CLASSES = (
+    libcst.Name,
+    libcst.Integer,
+    libcst.Float,
+    libcst.Imaginary,
+    libcst.SimpleString,
+)
+
+
+class _ReplaceTransformer(libcst.CSTTransformer):
+    def __init__(
+        self,
+        replacements: Dict[str, libcst.CSTNode],
+        parents: Mapping[libcst.CSTNode, libcst.CSTNode],
+    ) -> None:
         super().__init__()
         self.replacements = replacements
+        self.parents = parents
 
     def leave_Name(
         self, original_node: libcst.Name, updated_node: libcst.Name
@@ -108,9 +294,10 @@ class _ReplaceTransformer(libcst.CSTTransformer):
         new_node = self.replacements.get(updated_node.value)
         if not new_node:
             return updated_node
-        parent = self.get_metadata(
-            libcst.metadata.ParentNodeProvider, original_node
-        )
+        # Atoms have the highest precedence, so they never need parentheses.
+        if isinstance(new_node, _ATOM_CLASSES):
+            return new_node
+        parent = self.parents.get(original_node)
         if not parent:
             raise Exception("cannot find parent for node")
         # TODO: check if we need to clone the node before returning it. It may
@@ -123,13 +310,16 @@ class _ReplaceTransformer(libcst.CSTTransformer):
 
 def _replace_names(
     node: libcst.CSTNode,
-    wrapper: libcst.metadata.MetadataWrapper,
+    replacer: _ReplaceTransformer,
     replacements: Dict[str, libcst.CSTNode],
 ) -> libcst.CSTNode:
-    replacer = _ReplaceTransformer(replacements)
-    with replacer.resolve(wrapper):
+    replacer.replacements = replacements
+    try:
         # The result of node.visit can never be a RemovalSentinel.
         return cast(libcst.CSTNode, node.visit(replacer))
+    finally:
+        # Do not keep the matched nodes alive until the next replacement.
+        replacer.replacements = {}
 
 
 class CraftierTransformer(codemod.ContextAwareTransformer):
@@ -168,73 +358,8 @@ class CraftierTransformer(codemod.ContextAwareTransformer):
 
     def __init__(self, context: libcst.codemod.CodemodContext):
         super().__init__(context)
-        method_names = set()
-        for name in type(self).__dict__:
-            if name.endswith("_before") or name.endswith("_after"):
-                method_names.add(name.rsplit("_", 1)[0])
-        if len(method_names) != 1:
-            raise Exception(
-                f"Only 1 method is supported at the moment. Found: {method_names}"
-            )
-        # TODO: handle more method definitions
-        name = list(method_names)[0]
-        before = getattr(self, f"{name}_before", None)
-        after = getattr(self, f"{name}_after", None)
-        if not before or not after:
-            raise Exception(
-                f"Expected `{name}_before` and `{name}_after` to be defined"
-            )
-        transform = _get_expression_transform(before, after)
-
-        perf_name = f"{self.__class__.__name__}/{name}"
-        # pylint: disable=unused-argument
-        def custom_on_leave(
-            self: CraftierTransformer,
-            original_node: libcst.CSTNode,
-            updated_node: libcst.CSTNode,
-        ) -> libcst.CSTNode:
-            new_node = updated_node
-            status = "unchanged"
-            start = time.perf_counter_ns()
-            # We don't support wildcard patterns yet, so we can safely cast the
-            # results to single nodes.
-            matches = cast(
-                Dict[str, libcst.CSTNode],
-                libcst.matchers.extract(updated_node, transform.before),
-            )
-            if matches is not None:
-                actual_matches = check_matches(matches)
-                if actual_matches is not None:
-                    # TODO: make sure all new nodes have a different id
-                    new_node = _replace_names(
-                        transform.after, transform.wrapper, actual_matches
-                    )
-                    logger.debug(
-                        "{} changed file {}",
-                        perf_name,
-                        self.context.filename,
-                    )
-                    new_node = parenthesize.parenthesize_using_previous(
-                        new_node, updated_node
-                    )
-                    status = "modified"
-                    self._mark_as_modified()
-            end = time.perf_counter_ns()
-            performance.write(
-                {
-                    "name": perf_name,
-                    "time": (end - start) / 1e6,
-                    "status": status,
-                }
-            )
-            return new_node
-
-        # pylint: enable=unused-argument
-
-        custom_on_leave.__name__ = transform.visitor_method_name()
-        bound_leave = types.MethodType(custom_on_leave, self)
-        setattr(self, transform.visitor_method_name(), bound_leave)
-
-    def _mark_as_modified(self) -> None:
-        context = self.context.scratch.setdefault(codemod.CONTEXT_KEY, {})
-        context[self.context.filename] = True
+        # The leave method is bound to the class on its first instantiation,
+        # so that errors in the transform are only raised when it is used.
+        _, transform = _get_class_transform(type(self))
+        # Reused for every replacement, as only the replacements change.
+        self._replacer = _ReplaceTransformer({}, transform.parents)
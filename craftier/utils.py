@@ -1,5 +1,7 @@
+import ast
 import dataclasses
-from typing import Sequence
+import functools
+from typing import Any, List, Sequence, Tuple, Type
 
 import libcst
 
@@ -17,49 +19,84 @@ _SKIP_TO_STRING = frozenset(
 )
 
 
-def to_string(node: libcst.CSTNode) -> str:
-    """Yaml-like representation of a node."""
-    fields = [
+@functools.lru_cache(maxsize=4096)
+def literal_eval(value: str) -> Any:
+    """Cached version of `ast.literal_eval`.
+
+    The result is shared between calls, so it must not be modified.
+    """
+    return ast.literal_eval(value)
+
+
+@functools.lru_cache(maxsize=None)
+def _to_string_fields(
+    node_class: Type[libcst.CSTNode],
+) -> Tuple["dataclasses.Field[Any]", ...]:
+    """Return the fields of a node class to include in its representation."""
+    return tuple(
         f
-        for f in dataclasses.fields(node)
+        for f in dataclasses.fields(node_class)
         if f.name not in _SKIP_TO_STRING
         and "whitespace" not in f.name
         and not f.name.startswith("_")
-    ]
+    )
+
 
+def to_string(node: libcst.CSTNode) -> str:
+    """Yaml-like representation of a node."""
+    lines: List[str] = []
+    _write_node(node, "", 0, lines)
+    return "\n".join(lines)
+
+
+def _write_node(
+    node: libcst.CSTNode, head: str, depth: int, lines: List[str]
+) -> None:
+    """Write the lines representing the node, the first one starting by head.
+
+    Its fields are indented one level deeper than depth.
+    """
+    fields = _to_string_fields(node.__class__)
     if not fields:
-        return f"{type(node).__name__}"
+        lines.append(f"{head}{type(node).__name__}")
+        return
 
-    lines = [f"{type(node).__name__}:"]
+    lines.append(f"{head}{type(node).__name__}:")
+    indent = "  " * (depth + 1)
     for f in fields:
-        key = f.name
-        value = getattr(node, key)
+        value = getattr(node, f.name)
         if value == []:
             value = ()
         if f.default != value:
-            value_repr = _pretty_repr(value)
-            if not value_repr.startswith("\n"):
-                value_repr = f" {value_repr}"
-            lines.append(_indent(f"{key}:{value_repr}"))
-    return "\n".join(lines)
-
+            if (
+                not isinstance(value, str)
+                and isinstance(value, Sequence)
+                and value
+            ):
+                lines.append(f"{indent}{f.name}:")
+                _write_sequence(value, depth + 1, lines)
+            else:
+                _write_value(value, f"{indent}{f.name}: ", depth + 1, lines)
 
-def _indent(value: str) -> str:
-    return "\n".join(f"  {l}" for l in value.split("\n"))
 
-
-def _pretty_repr(value: object) -> str:
+def _write_value(
+    value: object, head: str, depth: int, lines: List[str]
+) -> None:
     if isinstance(value, libcst.CSTNode):
-        return to_string(value)
-
-    if not isinstance(value, str) and isinstance(value, Sequence):
-        return _pretty_repr_sequence(value)
-
-    return repr(value)
-
+        _write_node(value, head, depth, lines)
+    elif not isinstance(value, str) and isinstance(value, Sequence):
+        if value:
+            lines.append(head)
+            _write_sequence(value, depth, lines)
+        else:
+            lines.append(f"{head}[]")
+    else:
+        lines.append(f"{head}{value!r}")
 
-def _pretty_repr_sequence(seq: Sequence[object]) -> str:
-    if len(seq) == 0:
-        return "[]"
 
-    return "\n".join(["", *[f"- {_pretty_repr(el)}" for el in seq]])
+def _write_sequence(
+    seq: Sequence[object], depth: int, lines: List[str]
+) -> None:
+    head = f"{'  ' * depth}- "
+    for element in seq:
+        _write_value(element, head, depth, lines)
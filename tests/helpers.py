@@ -1,8 +1,37 @@
 import dataclasses
-from typing import Sequence
+import functools
+from typing import Dict, FrozenSet, Sequence, Tuple
 
+import libcst
+import libcst.matchers
 from libcst.matchers import BaseMatcherNode
 
+import craftier.matcher
+from craftier import libcst_typing
+
+
+@functools.lru_cache(maxsize=None)
+def parse_expression(source: str) -> libcst.BaseExpression:
+    """Cached version of `libcst.parse_expression`.
+
+    Nodes are immutable, so the same tree can be shared by all the tests.
+    """
+    return libcst.parse_expression(source)
+
+
+@functools.lru_cache(maxsize=None)
+def matcher_for(
+    source: str, placeholders: FrozenSet[str] = frozenset()
+) -> libcst_typing.Matcher:
+    """Cached matcher of an expression, whose placeholders match anything.
+
+    Matchers are immutable as well, so they can be shared by all the tests.
+    """
+    return craftier.matcher.from_node(
+        parse_expression(source),
+        dict.fromkeys(placeholders, libcst.matchers.DoNotCare()),
+    )
+
 
 def matcher_deep_equals(first: object, second: object) -> bool:
     """Check whether two matchers are equivalent."""
@@ -35,6 +64,19 @@ def _deep_equals_matcher_sequence(
     )
 
 
+# Field names of each matcher class.
+_MATCHER_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def _matcher_field_names(matcher_class: type) -> Tuple[str, ...]:
+    names = _MATCHER_FIELD_NAMES.get(matcher_class)
+    if names is None:
+        names = _MATCHER_FIELD_NAMES[matcher_class] = tuple(
+            field.name for field in dataclasses.fields(matcher_class)
+        )
+    return names
+
+
 def _deep_equals_matcher_node(
     first: BaseMatcherNode, second: BaseMatcherNode
 ) -> bool:
@@ -43,9 +85,9 @@ def _deep_equals_matcher_node(
     if first is second:  # short-circuit
         return True
     # Ignore metadata and other hidden fields
-    for field in dataclasses.fields(first):
-        first_value = getattr(first, field.name)
-        second_value = getattr(second, field.name)
+    for name in _matcher_field_names(type(first)):
+        first_value = getattr(first, name)
+        second_value = getattr(second, name)
         if not matcher_deep_equals(first_value, second_value):
             return False
     return True
@@ -47,3 +47,9 @@ class ClassFinderTest(unittest.TestCase):
             class_finder.from_qualified_names(int, ["tests.test_class_finder"]),
             [],
         )
+
+    def test_cached(self):
+        first = class_finder.from_qualified_names(_Needle, ["tests"])
+        second = class_finder.from_qualified_names(_Needle, ("tests",))
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
@@ -96,6 +96,44 @@ class TestCli(unittest.TestCase):
                 pathlib.Path("input.py").read_text(), REFACTORED_FILE_CONTENTS
             )
 
+    def testRefactorManyFiles(self) -> None:
+        # Enough files to be refactored by a pool of workers.
+        names = [f"input{i}.py" for i in range(8)]
+        with self.runner.isolated_filesystem():
+            for name in names:
+                pathlib.Path(name).write_text(INPUT_FILE_CONTENTS)
+            result = self.runner.invoke(
+                cli.app, ["refactor", *names], catch_exceptions=False
+            )
+            self.assertIn("All done!", result.output)
+            self.assertIn("8 files refactored", result.output)
+            self.assertEqual(result.exit_code, 0)
+
+            for name in names:
+                self.assertEqual(
+                    pathlib.Path(name).read_text(), REFACTORED_FILE_CONTENTS
+                )
+
+    def testRefactorInvalidFile(self) -> None:
+        with self.runner.isolated_filesystem():
+            pathlib.Path("input.py").write_text(INPUT_FILE_CONTENTS)
+            pathlib.Path("invalid.py").write_text("def (:")
+            result = self.runner.invoke(
+                cli.app,
+                ["refactor", "invalid.py", "input.py"],
+                catch_exceptions=False,
+            )
+            self.assertIn("Oh no!", result.output)
+            self.assertIn(
+                "1 file refactored, 1 file left unchanged, 1 file failed",
+                result.output,
+            )
+            self.assertEqual(result.exit_code, 1)
+
+            self.assertEqual(
+                pathlib.Path("input.py").read_text(), REFACTORED_FILE_CONTENTS
+            )
+
     def testRefactorFilesDebugMode(self) -> None:
         with self.runner.isolated_filesystem():
             pathlib.Path("input.py").write_text(INPUT_FILE_CONTENTS)
@@ -1,6 +1,10 @@
+import unittest
+from typing import Callable, List, cast
+
 import libcst
 import libcst.codemod
 import libcst.matchers
+import libcst.metadata
 from typing_extensions import Annotated
 
 from craftier import codemod, transformer
@@ -36,6 +40,10 @@ class ReorderAddTransformer(transformer.CraftierTransformer):
 # pylint: enable=pointless-statement,no-self-use
 
 
+class PositionTransformer(codemod.ContextAwareTransformer):
+    METADATA_DEPENDENCIES = (libcst.metadata.PositionProvider,)
+
+
 class CodemodTest(libcst.codemod.CodemodTest):
     TRANSFORM = codemod.BatchedCodemod
 
@@ -73,3 +81,155 @@ class CodemodTest(libcst.codemod.CodemodTest):
             transformers=[ReorderAddTransformer],
             max_executions=4,
         )
+
+    def test_batched_transformer_not_shared(self) -> None:
+        context = libcst.codemod.CodemodContext()
+        first = codemod.BatchedCodemod(context, [TwoXAddTransformer])
+        second = codemod.BatchedCodemod(context, (TwoXAddTransformer,))
+        first.transform_module(libcst.parse_module("a + a"))
+        second.transform_module(libcst.parse_module("a + a"))
+        # pylint: disable=protected-access
+        self.assertIsNot(
+            first._batched_transformer, second._batched_transformer
+        )
+        self.assertIn(TwoXAddTransformer, codemod._LEAVE_CACHE)
+
+    def test_needs_metadata(self) -> None:
+        context = libcst.codemod.CodemodContext()
+        self.assertFalse(
+            codemod.BatchedCodemod(
+                context, [TwoXAddTransformer]
+            )._needs_metadata
+        )
+        self.assertTrue(
+            codemod.BatchedCodemod(
+                context, [TwoXAddTransformer, PositionTransformer]
+            )._needs_metadata
+        )
+
+
+class ContextAwareTransformerTest(unittest.TestCase):
+    def test_get_leave_funcs(self) -> None:
+        transformer = TwoXAddTransformer(libcst.codemod.CodemodContext())
+        self.assertEqual(
+            list(transformer.get_leave_funcs()), ["leave_BinaryOperation"]
+        )
+
+
+# pylint: disable=protected-access
+def _leave_methods(
+    *methods: Callable[..., libcst.CSTNode]
+) -> List[codemod._LeaveMethod]:
+    """Type the given functions as the leave methods of a transformer."""
+    return [cast(codemod._LeaveMethod, method) for method in methods]
+
+
+class BatchedTransformerTest(unittest.TestCase):
+    def test_skip_leaf_children(self) -> None:
+        batched_transformer = codemod._BatchedTransformer({})
+        self.assertFalse(batched_transformer.on_visit(libcst.Name("a")))
+        self.assertTrue(
+            batched_transformer.on_visit(libcst.parse_expression("a + b"))
+        )
+
+    def test_visit_leaf_children_when_trivia_is_handled(self) -> None:
+        batched_transformer = codemod._BatchedTransformer({libcst.Comment: []})
+        self.assertTrue(batched_transformer.on_visit(libcst.Name("a")))
+
+    def test_incremental_pass_visits_new_nodes(self) -> None:
+        visited = []
+
+        def leave_name(
+            original_node: libcst.Name, updated_node: libcst.Name
+        ) -> libcst.Name:
+            visited.append(original_node.value)
+            return updated_node
+
+        transformer = TwoXAddTransformer(libcst.codemod.CodemodContext())
+        batched_transformer = codemod._BatchedTransformer(
+            {
+                libcst.BinaryOperation: _leave_methods(
+                    transformer.leave_BinaryOperation
+                ),
+                libcst.Name: _leave_methods(leave_name),
+            }
+        )
+        batched_transformer.start_pass(incremental=False)
+        module = libcst.parse_module("a + a\nb\n").visit(batched_transformer)
+        self.assertEqual(visited, ["a", "a", "b"])
+
+        visited.clear()
+        batched_transformer.start_pass(incremental=True)
+        module.visit(batched_transformer)
+        self.assertEqual(visited, ["a"])
+
+    def test_operator_methods(self) -> None:
+        visited = []
+
+        @codemod.for_operator(libcst.Add)
+        def leave_add(
+            original_node: libcst.BinaryOperation,
+            updated_node: libcst.BinaryOperation,
+        ) -> libcst.BinaryOperation:
+            visited.append("add")
+            return updated_node.with_changes(operator=libcst.Subtract())
+
+        @codemod.for_operator(libcst.Subtract)
+        def leave_subtract(
+            original_node: libcst.BinaryOperation,
+            updated_node: libcst.BinaryOperation,
+        ) -> libcst.BinaryOperation:
+            visited.append("subtract")
+            return updated_node
+
+        def leave_any(
+            original_node: libcst.BinaryOperation,
+            updated_node: libcst.BinaryOperation,
+        ) -> libcst.BinaryOperation:
+            visited.append("any")
+            return updated_node
+
+        batched_transformer = codemod._BatchedTransformer(
+            {
+                libcst.BinaryOperation: _leave_methods(
+                    leave_add, leave_subtract, leave_any
+                )
+            }
+        )
+        batched_transformer.start_pass(incremental=False)
+        libcst.parse_module("a + b\na - b\na * b\n").visit(batched_transformer)
+        self.assertEqual(visited, ["add", "subtract", "any", "any"])
+
+    def test_incremental_pass_skips_unchanged_subtrees(self) -> None:
+        visited = []
+
+        def leave_call(
+            original_node: libcst.Call, updated_node: libcst.Call
+        ) -> libcst.Call:
+            visited.append(libcst.Module([]).code_for_node(original_node))
+            return updated_node
+
+        transformer = TwoXAddTransformer(libcst.codemod.CodemodContext())
+        batched_transformer = codemod._BatchedTransformer(
+            {
+                libcst.BinaryOperation: _leave_methods(
+                    transformer.leave_BinaryOperation
+                ),
+                libcst.Call: _leave_methods(leave_call),
+            }
+        )
+        batched_transformer.start_pass(incremental=False)
+        module = libcst.parse_module("f(a + a)\ng(b)\n").visit(
+            batched_transformer
+        )
+        self.assertEqual(visited, ["f(a + a)", "g(b)"])
+
+        visited.clear()
+        batched_transformer.start_pass(incremental=True)
+        module = module.visit(batched_transformer)
+        self.assertEqual(visited, ["f(a * 2)"])
+
+        visited.clear()
+        batched_transformer.start_pass(incremental=True)
+        module.visit(batched_transformer)
+        self.assertEqual(visited, [])
@@ -55,6 +55,46 @@ class ConfigTest(pyfakefs.fake_filesystem_unittest.TestCase):
             ),
         )
 
+    def test_load_from_path_comments_and_separators(self):
+        config_path = pathlib.Path("/path/config.ini")
+        config_data = textwrap.dedent(
+            """
+        # leading comment
+        [other]
+        packages = other.refactors
+
+        [craftier]
+        ; comment
+        PACKAGES: a.refactors,
+
+          b.refactors
+        excluded = a.refactors.Foo
+        """
+        )
+        self.fs.create_file(config_path, contents=config_data)
+        self.assertEqual(
+            craftier.config.load(config_path),
+            craftier.config.Config(
+                path=config_path,
+                packages=["a.refactors", "b.refactors"],
+                excluded=["a.refactors.Foo"],
+            ),
+        )
+
+    def test_load_from_path_option_without_section(self):
+        config_path = pathlib.Path("/path/config.ini")
+        self.fs.create_file(config_path, contents="packages=a\n[craftier]")
+        with self.assertRaises(craftier.config.InvalidConfigError):
+            craftier.config.load(config_path)
+
+    def test_load_from_path_duplicate_option(self):
+        config_path = pathlib.Path("/path/config.ini")
+        self.fs.create_file(
+            config_path, contents="[craftier]\npackages=a\npackages=b"
+        )
+        with self.assertRaises(craftier.config.InvalidConfigError):
+            craftier.config.load(config_path)
+
     def test_load_from_default(self):
         self.assertEqual(
             craftier.config.load(None),
@@ -80,6 +120,22 @@ class ConfigTest(pyfakefs.fake_filesystem_unittest.TestCase):
             craftier.config.find_path(pathlib.Path("/tmp/foo/bar"))
         )
 
+    def test_find_path_found_next_to_git(self):
+        self.fs.create_dir("/tmp/foo/.git")
+        self.fs.create_file("/tmp/foo/.craftier.ini")
+        self.assertEqual(
+            craftier.config.find_path(pathlib.Path("/tmp/foo/bar")),
+            pathlib.Path("/tmp/foo/.craftier.ini"),
+        )
+
+    def test_find_path_ignores_config_dir(self):
+        self.fs.create_dir("/tmp/foo/bar/.craftier.ini")
+        self.fs.create_file("/tmp/foo/.craftier.ini")
+        self.assertEqual(
+            craftier.config.find_path(pathlib.Path("/tmp/foo/bar")),
+            pathlib.Path("/tmp/foo/.craftier.ini"),
+        )
+
     def test_find_path_stops_at_mercurial(self):
         self.fs.create_file("/tmp/foo/.craftier.ini")
         self.fs.create_dir("/tmp/foo/bar/.hg")
@@ -1,5 +1,6 @@
 import pathlib
 import time
+from unittest import mock
 
 import pyfakefs.fake_filesystem_unittest
 
@@ -31,3 +32,26 @@ class FsTest(pyfakefs.fake_filesystem_unittest.TestCase):
             fs.get_modified_files(self.files, since=now),
             [self.files[0], self.files[2]],
         )
+
+    def test_modified_files_preserve_order(self):
+        now = time.time()
+        for f in self.files:
+            f.touch()
+        files = [self.files[2], self.files[1], self.files[0]]
+        self.assertEqual(fs.get_modified_files(files, since=now), files)
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            fs.get_modified_files(
+                self.files + [pathlib.Path("/tmp/missing")], since=0
+            )
+
+    def test_modified_files_with_scandir(self):
+        now = time.time()
+        self.files[0].touch()
+        self.files[2].write_text("foo")
+        with mock.patch.object(fs, "_SCANDIR_CACHES_STAT", True):
+            self.assertEqual(
+                fs.get_modified_files(self.files, since=now),
+                [self.files[0], self.files[2]],
+            )
@@ -49,6 +49,25 @@ class FunctionParserTest(unittest.TestCase):
                 f"Matcher '{k}' is not equal",
             )
 
+    def test_args_to_matchers_string_annotations(self) -> None:
+        # pylint: disable=unused-argument
+        def test_function(a: "int", b: "LiteralInt"):
+            pass
+
+        # pylint: enable=unused-argument
+
+        matchers = function_parser.args_to_matchers(test_function)
+        self.assertTrue(
+            helpers.matcher_deep_equals(
+                matchers["a"], libcst.matchers.DoNotCare()
+            )
+        )
+        self.assertTrue(
+            helpers.matcher_deep_equals(
+                matchers["b"], libcst.matchers.Integer()
+            )
+        )
+
     def test_empty_args_to_matchers(self) -> None:
         def test_function():
             pass
@@ -56,6 +75,19 @@ class FunctionParserTest(unittest.TestCase):
         matchers = function_parser.args_to_matchers(test_function)
         self.assertEqual(matchers, {})
 
+    def test_args_to_matchers_cached(self) -> None:
+        # pylint: disable=unused-argument
+        class Transformer:
+            def function(self, x: LiteralInt):
+                pass
+
+        # pylint: enable=unused-argument
+
+        self.assertIs(
+            function_parser.args_to_matchers(Transformer().function),
+            function_parser.args_to_matchers(Transformer().function),
+        )
+
     def test_parse_with_docstring(self) -> None:
         # pylint: disable=pointless-statement
         def test_function():
@@ -120,6 +152,17 @@ class FunctionParserTest(unittest.TestCase):
             libcst.SimpleStatementLine(body=[libcst.Expr(libcst.Name("x"))]),
         )
 
+    def test_parse_cached(self) -> None:
+        # pylint: disable=pointless-statement
+        def test_function(x):
+            x
+
+        # pylint: enable=pointless-statement
+        self.assertIs(
+            function_parser.parse(test_function),
+            function_parser.parse(test_function),
+        )
+
     def test_parse_unused_args(self) -> None:
         # pylint: disable=pointless-statement,unused-argument
         def test_function(x):
@@ -1,4 +1,3 @@
-import textwrap
 import unittest
 from typing import Set
 
@@ -7,6 +6,13 @@ import libcst.matchers
 import parameterized
 
 import craftier.matcher
+from tests import helpers
+
+FUNCTION_DEF = """\
+def test():
+    name = "World"
+    print(f"Hello {name}")
+"""
 
 
 class NodeTest(unittest.TestCase):
@@ -22,12 +28,10 @@ class NodeTest(unittest.TestCase):
     def test_integer(
         self, _name: str, expression1: str, expression2: str
     ) -> None:
-        matcher = craftier.matcher.from_node(
-            libcst.parse_expression(expression1), {}
-        )
+        matcher = helpers.matcher_for(expression1)
         self.assertTrue(
             craftier.matcher.matches(
-                libcst.parse_expression(expression2), matcher
+                helpers.parse_expression(expression2), matcher
             )
         )
 
@@ -43,12 +47,10 @@ class NodeTest(unittest.TestCase):
     def test_string(
         self, _name: str, expression1: str, expression2: str
     ) -> None:
-        matcher = craftier.matcher.from_node(
-            libcst.parse_expression(expression1), {}
-        )
+        matcher = helpers.matcher_for(expression1)
         self.assertTrue(
             craftier.matcher.matches(
-                libcst.parse_expression(expression2), matcher
+                helpers.parse_expression(expression2), matcher
             )
         )
 
@@ -61,17 +63,17 @@ class NodeTest(unittest.TestCase):
             ("plain", "'some' 'string'", "'somestring'"),
             ("f string", "'some' 'string' f'{x}'", "f'somestring{x}'"),
             ("f string", "'some' 'string' f' {x}'", "f'somestring {x}'"),
+            ("f string quotes", "'it\\'s' f'{x}'", 'f"it\'s{x}"'),
+            ("f string escapes", "'a\\n\\x00' f'{x}'", "f'a\\n\\x00{x}'"),
         )
     )
     def test_concatenated_string(
         self, _name: str, expression1: str, expression2: str
     ) -> None:
-        matcher = craftier.matcher.from_node(
-            libcst.parse_expression(expression1), {}
-        )
+        matcher = helpers.matcher_for(expression1)
         self.assertTrue(
             craftier.matcher.matches(
-                libcst.parse_expression(expression2), matcher
+                helpers.parse_expression(expression2), matcher
             )
         )
 
@@ -86,28 +88,26 @@ class NodeTest(unittest.TestCase):
     def test_fstring(
         self, _name: str, expression1: str, expression2: str
     ) -> None:
-        matcher = craftier.matcher.from_node(
-            libcst.parse_expression(expression1), {}
-        )
+        matcher = helpers.matcher_for(expression1)
         self.assertTrue(
             craftier.matcher.matches(
-                libcst.parse_expression(expression2), matcher
+                helpers.parse_expression(expression2), matcher
             )
         )
 
     def test_fstring_with_placeholders(self) -> None:
         matcher = craftier.matcher.from_node(
-            libcst.parse_expression("f'{x} and {y}'"),
+            helpers.parse_expression("f'{x} and {y}'"),
             {"x": libcst.matchers.DoNotCare(), "y": libcst.matchers.Integer()},
         )
         self.assertTrue(
             craftier.matcher.matches(
-                libcst.parse_expression("f'{a + b} and {32}'"), matcher
+                helpers.parse_expression("f'{a + b} and {32}'"), matcher
             )
         )
         self.assertFalse(
             craftier.matcher.matches(
-                libcst.parse_expression("f'{a + b} and {z}'"), matcher
+                helpers.parse_expression("f'{a + b} and {z}'"), matcher
             )
         )
 
@@ -119,12 +119,10 @@ class NodeTest(unittest.TestCase):
         )
     )
     def test_list(self, _name: str, expression1: str, expression2: str) -> None:
-        matcher = craftier.matcher.from_node(
-            libcst.parse_expression(expression1), {}
-        )
+        matcher = helpers.matcher_for(expression1)
         self.assertTrue(
             craftier.matcher.matches(
-                libcst.parse_expression(expression2), matcher
+                helpers.parse_expression(expression2), matcher
             )
         )
 
@@ -136,12 +134,10 @@ class NodeTest(unittest.TestCase):
         )
     )
     def test_set(self, _name: str, expression1: str, expression2: str) -> None:
-        matcher = craftier.matcher.from_node(
-            libcst.parse_expression(expression1), {}
-        )
+        matcher = helpers.matcher_for(expression1)
         self.assertTrue(
             craftier.matcher.matches(
-                libcst.parse_expression(expression2), matcher
+                helpers.parse_expression(expression2), matcher
             )
         )
 
@@ -153,12 +149,10 @@ class NodeTest(unittest.TestCase):
         )
     )
     def test_dict(self, _name: str, expression1: str, expression2: str) -> None:
-        matcher = craftier.matcher.from_node(
-            libcst.parse_expression(expression1), {}
-        )
+        matcher = helpers.matcher_for(expression1)
         self.assertTrue(
             craftier.matcher.matches(
-                libcst.parse_expression(expression2), matcher
+                helpers.parse_expression(expression2), matcher
             )
         )
 
@@ -176,12 +170,10 @@ class NodeTest(unittest.TestCase):
     def test_tuple(
         self, _name: str, expression1: str, expression2: str
     ) -> None:
-        matcher = craftier.matcher.from_node(
-            libcst.parse_expression(expression1), {}
-        )
+        matcher = helpers.matcher_for(expression1)
         self.assertTrue(
             craftier.matcher.matches(
-                libcst.parse_expression(expression2), matcher
+                helpers.parse_expression(expression2), matcher
             )
         )
 
@@ -194,31 +186,17 @@ class NodeTest(unittest.TestCase):
     def test_optional_parens(
         self, _name: str, expression1: str, expression2: str
     ) -> None:
-        matcher = craftier.matcher.from_node(
-            libcst.parse_expression(expression1), {}
-        )
+        matcher = helpers.matcher_for(expression1)
         self.assertTrue(
             craftier.matcher.matches(
-                libcst.parse_expression(expression2), matcher
+                helpers.parse_expression(expression2), matcher
             )
         )
 
     def test_function(self) -> None:
-        function_def = textwrap.dedent(
-            """
-            def test():
-                name = "World"
-                print(f"Hello {name}")
-        """.strip()
-        )
-        matcher = craftier.matcher.from_node(
-            libcst.parse_statement(function_def), {}
-        )
-        self.assertTrue(
-            craftier.matcher.matches(
-                libcst.parse_statement(function_def), matcher
-            )
-        )
+        function_def = libcst.parse_statement(FUNCTION_DEF)
+        matcher = craftier.matcher.from_node(function_def, {})
+        self.assertTrue(craftier.matcher.matches(function_def, matcher))
 
     @parameterized.parameterized.expand(
         (
@@ -238,12 +216,9 @@ class NodeTest(unittest.TestCase):
         expression2: str,
         placeholders: Set[str],
     ) -> None:
-        matcher = craftier.matcher.from_node(
-            libcst.parse_expression(expression1),
-            {p: libcst.matchers.DoNotCare() for p in placeholders},
-        )
+        matcher = helpers.matcher_for(expression1, frozenset(placeholders))
         self.assertTrue(
             craftier.matcher.matches(
-                libcst.parse_expression(expression2), matcher
+                helpers.parse_expression(expression2), matcher
             )
         )
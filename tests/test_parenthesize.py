@@ -1,4 +1,3 @@
-import itertools
 import unittest
 
 import libcst
@@ -91,31 +90,42 @@ EXAMPLES = (
     ],
 )
 
-SAME_PRECEDENCE = list(
-    itertools.chain.from_iterable(
-        [itertools.product(exps, repeat=2) for exps in EXAMPLES]
-    )
+SAME_PRECEDENCE = tuple(
+    (node, parent) for exps in EXAMPLES for node in exps for parent in exps
 )
 
-LOWER_PRECEDENCE = list(
-    itertools.chain.from_iterable(
-        [
-            itertools.product(exps, exps_lower)
-            for exps, exps_lower in zip(EXAMPLES[1:], EXAMPLES)
-        ]
-    )
+LOWER_PRECEDENCE = tuple(
+    (node, parent)
+    for exps, exps_lower in zip(EXAMPLES[1:], EXAMPLES)
+    for node in exps
+    for parent in exps_lower
 )
 
-HIGHER_PRECEDENCE = list(
-    itertools.chain.from_iterable(
-        [
-            itertools.product(exps, exps_higher)
-            for exps, exps_higher in zip(EXAMPLES, EXAMPLES[1:])
-        ]
-    )
+HIGHER_PRECEDENCE = tuple(
+    (node, parent)
+    for exps, exps_higher in zip(EXAMPLES, EXAMPLES[1:])
+    for node in exps
+    for parent in exps_higher
 )
 
 
+# Nodes are immutable, so the examples below are shared by the tests.
+SUM = libcst.parse_expression("a + b")
+PARENTHESIZED_SUM = libcst.parse_expression("(a + b)")
+PRODUCT = libcst.parse_expression("a * (a + b)")
+TUPLE = libcst.parse_expression("1, 2, 3")
+RETURN = libcst.parse_statement("return foo")
+CALL = libcst.Call(func=libcst.Name("func"))
+GENERATOR = libcst.parse_expression("(x for x in foo)").with_changes(
+    lpar=[], rpar=[]
+)
+GENERATOR_ONLY_ARGUMENT_CALL = libcst.parse_expression("max(x for x in foo)")
+GENERATOR_MANY_ARGUMENTS_CALL = libcst.parse_expression(
+    "max((x for x in foo), foo)"
+)
+GENERATOR_RETURN = libcst.parse_statement("return (x for x in foo)")
+
+
 class ParenthesizeTestCase(unittest.TestCase):
     """Mixin for adding parentheses check assertions."""
 
@@ -127,55 +137,43 @@ class ParenthesizeTestCase(unittest.TestCase):
 
 class ParenthesizeUsingParentTest(ParenthesizeTestCase):
     def test_expression_already_parenthesized(self) -> None:
-        node = libcst.parse_expression("(a + b)")
-        new_node = parenthesize.parenthesize_using_parent(
-            node, libcst.parse_expression("a * (a + b)")
-        )
+        node = PARENTHESIZED_SUM
+        new_node = parenthesize.parenthesize_using_parent(node, PRODUCT)
         self.assertIs(new_node, node)
 
     def test_not_parenthesizable(self) -> None:
-        node = libcst.parse_statement("return foo")
-        new_node = parenthesize.parenthesize_using_parent(
-            node, libcst.parse_expression("a * (a + b)")
-        )
+        node = RETURN
+        new_node = parenthesize.parenthesize_using_parent(node, PRODUCT)
         self.assertIs(new_node, node)
 
     def test_tuple_requires_paren(self) -> None:
-        node = libcst.parse_expression("1, 2, 3")
-        new_node = parenthesize.parenthesize_using_parent(
-            node, libcst.Call(func=libcst.Name("func"))
-        )
+        node = TUPLE
+        new_node = parenthesize.parenthesize_using_parent(node, CALL)
         self.assert_has_parentheses(new_node)
 
     def test_tuple_return(self) -> None:
-        node = libcst.parse_expression("1, 2, 3")
+        node = TUPLE
         new_node = parenthesize.parenthesize_using_parent(node, libcst.Return())
         self.assertIs(new_node, node)
 
     def test_generator_only_argument_function_call(self) -> None:
-        node = libcst.parse_expression("(x for x in foo)").with_changes(
-            lpar=[], rpar=[]
-        )
+        node = GENERATOR
         new_node = parenthesize.parenthesize_using_parent(
-            node, libcst.parse_expression("max(x for x in foo)")
+            node, GENERATOR_ONLY_ARGUMENT_CALL
         )
         self.assertIs(new_node, node)
 
     def test_generator_many_argument_function_call(self) -> None:
-        node = libcst.parse_expression("(x for x in foo)").with_changes(
-            lpar=[], rpar=[]
-        )
+        node = GENERATOR
         new_node = parenthesize.parenthesize_using_parent(
-            node, libcst.parse_expression("max((x for x in foo), foo)")
+            node, GENERATOR_MANY_ARGUMENTS_CALL
         )
         self.assert_has_parentheses(new_node)
 
     def test_generator_return(self) -> None:
-        node = libcst.parse_expression("(x for x in foo)").with_changes(
-            lpar=[], rpar=[]
-        )
+        node = GENERATOR
         new_node = parenthesize.parenthesize_using_parent(
-            node, libcst.parse_statement("return (x for x in foo)")
+            node, GENERATOR_RETURN
         )
         self.assert_has_parentheses(new_node)
 
@@ -203,64 +201,52 @@ class ParenthesizeUsingParentTest(ParenthesizeTestCase):
 
 class ParenthesizeUsingPreviousTest(ParenthesizeTestCase):
     def test_expression_previous_parenthesized(self) -> None:
-        node = libcst.parse_expression("a + b")
+        node = SUM
         new_node = parenthesize.parenthesize_using_previous(
-            node, libcst.parse_expression("(a + b)")
+            node, PARENTHESIZED_SUM
         )
         self.assert_has_parentheses(new_node)
 
     def test_expression_already_parenthesized(self) -> None:
-        node = libcst.parse_expression("(a + b)")
-        new_node = parenthesize.parenthesize_using_previous(
-            node, libcst.parse_expression("a * (a + b)")
-        )
+        node = PARENTHESIZED_SUM
+        new_node = parenthesize.parenthesize_using_previous(node, PRODUCT)
         self.assertIs(new_node, node)
 
     def test_not_parenthesizable(self) -> None:
-        node = libcst.parse_statement("return foo")
-        new_node = parenthesize.parenthesize_using_previous(
-            node, libcst.parse_expression("a * (a + b)")
-        )
+        node = RETURN
+        new_node = parenthesize.parenthesize_using_previous(node, PRODUCT)
         self.assertIs(new_node, node)
 
     def test_tuple_requires_paren(self) -> None:
-        node = libcst.parse_expression("1, 2, 3")
-        new_node = parenthesize.parenthesize_using_previous(
-            node, libcst.Call(func=libcst.Name("func"))
-        )
+        node = TUPLE
+        new_node = parenthesize.parenthesize_using_previous(node, CALL)
         self.assert_has_parentheses(new_node)
 
     def test_tuple_return(self) -> None:
-        node = libcst.parse_expression("1, 2, 3")
+        node = TUPLE
         new_node = parenthesize.parenthesize_using_previous(
             node, libcst.Return()
         )
         self.assert_has_parentheses(new_node)
 
     def test_generator_only_argument_function_call(self) -> None:
-        node = libcst.parse_expression("(x for x in foo)").with_changes(
-            lpar=[], rpar=[]
-        )
+        node = GENERATOR
         new_node = parenthesize.parenthesize_using_previous(
-            node, libcst.parse_expression("max(x for x in foo)")
+            node, GENERATOR_ONLY_ARGUMENT_CALL
         )
         self.assert_has_parentheses(new_node)
 
     def test_generator_many_argument_function_call(self) -> None:
-        node = libcst.parse_expression("(x for x in foo)").with_changes(
-            lpar=[], rpar=[]
-        )
+        node = GENERATOR
         new_node = parenthesize.parenthesize_using_previous(
-            node, libcst.parse_expression("max((x for x in foo), foo)")
+            node, GENERATOR_MANY_ARGUMENTS_CALL
         )
         self.assert_has_parentheses(new_node)
 
     def test_generator_return(self) -> None:
-        node = libcst.parse_expression("(x for x in foo)").with_changes(
-            lpar=[], rpar=[]
-        )
+        node = GENERATOR
         new_node = parenthesize.parenthesize_using_previous(
-            node, libcst.parse_statement("return (x for x in foo)")
+            node, GENERATOR_RETURN
         )
         self.assert_has_parentheses(new_node)
 
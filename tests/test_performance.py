@@ -1,7 +1,12 @@
 import unittest
+from unittest import mock
 
 from craftier import performance
 
+FOO_ENTRY = {"foo": 1}
+BAR_ENTRY = {"bar": 2}
+BAZ_ENTRY = {"baz": 3}
+
 
 # pylint: disable=protected-access
 class PerformanceTest(unittest.TestCase):
@@ -22,30 +27,69 @@ class PerformanceTest(unittest.TestCase):
         performance.enable()
         self.assertIsNotNone(performance._config.file)
 
+    def test_is_enabled(self) -> None:
+        self.assertFalse(performance.is_enabled())
+        performance.enable()
+        self.assertTrue(performance.is_enabled())
+        performance.disable()
+        self.assertFalse(performance.is_enabled())
+
     def test_enable_twice(self) -> None:
         performance.enable()
         with self.assertRaises(performance.PerformanceError):
             performance.enable()
 
     def test_read_not_enabled(self) -> None:
-        self.assertEqual(performance.read(), [])
+        self.assertEqual(list(performance.read()), [])
 
     def test_read_empty(self) -> None:
         performance.enable()
-        self.assertEqual(performance.read(), [])
+        self.assertEqual(list(performance.read()), [])
 
     def test_write_read(self) -> None:
         performance.enable()
-        performance.write({"foo": 1})
-        performance.write({"bar": 2})
-        self.assertEqual(performance.read(), [{"foo": 1}, {"bar": 2}])
+        performance.write(FOO_ENTRY)
+        performance.write(BAR_ENTRY)
+        self.assertEqual(list(performance.read()), [FOO_ENTRY, BAR_ENTRY])
 
     def test_write_read_write_read(self) -> None:
         performance.enable()
-        performance.write({"foo": 1})
-        self.assertEqual(performance.read(), [{"foo": 1}])
-        performance.write({"bar": 2})
-        self.assertEqual(performance.read(), [{"foo": 1}, {"bar": 2}])
+        performance.write(FOO_ENTRY)
+        self.assertEqual(list(performance.read()), [FOO_ENTRY])
+        performance.write(BAR_ENTRY)
+        self.assertEqual(list(performance.read()), [FOO_ENTRY, BAR_ENTRY])
+
+    def test_write_after_partial_read(self) -> None:
+        performance.enable()
+        performance.write(FOO_ENTRY)
+        performance.write(BAR_ENTRY)
+        self.assertEqual(next(performance.read()), FOO_ENTRY)
+        performance.write(BAZ_ENTRY)
+        self.assertEqual(
+            list(performance.read()), [FOO_ENTRY, BAR_ENTRY, BAZ_ENTRY]
+        )
+
+    def test_write_while_reading(self) -> None:
+        performance.enable()
+        performance.write(FOO_ENTRY)
+        performance.write(BAR_ENTRY)
+        entries = performance.read()
+        self.assertEqual(next(entries), FOO_ENTRY)
+        performance.write(BAZ_ENTRY)
+        self.assertEqual(list(entries), [BAR_ENTRY, BAZ_ENTRY])
+        self.assertEqual(
+            list(performance.read()), [FOO_ENTRY, BAR_ENTRY, BAZ_ENTRY]
+        )
+
+    def test_read_in_chunks(self) -> None:
+        performance.enable()
+        performance.write(FOO_ENTRY)
+        performance.write(BAR_ENTRY)
+        with mock.patch.object(performance, "_READ_CHUNK_SIZE", 1):
+            entries = performance.read()
+            self.assertEqual(next(entries), FOO_ENTRY)
+            performance.write(BAZ_ENTRY)
+            self.assertEqual(list(entries), [BAR_ENTRY, BAZ_ENTRY])
 
     def test_disable(self) -> None:
         performance.enable()
@@ -46,6 +46,64 @@ class SimpleExpressionTransformerTest(libcst.codemod.CodemodTest):
         self.assertCodemod("foo + old_api", "foo + new_api")
 
 
+class TransformCacheTest(unittest.TestCase):
+    def test_transform_shared_between_instances(self) -> None:
+        first = SimpleExpressionTransformer(libcst.codemod.CodemodContext())
+        second = SimpleExpressionTransformer(libcst.codemod.CodemodContext())
+        self.assertIsNot(first.leave_Name, second.leave_Name)
+        self.assertIn("leave_Name", vars(SimpleExpressionTransformer))
+        self.assertNotIn("leave_Name", vars(first))
+
+    def test_repeated_placeholders(self) -> None:
+        # pylint: disable=protected-access
+        _, transform = transformer._get_class_transform(
+            ParameterizedExpressionTransformer
+        )
+        self.assertFalse(transform.repeated_placeholders)
+        _, transform = transformer._get_class_transform(
+            RepeatedParameterExpressionTransformer
+        )
+        self.assertTrue(transform.repeated_placeholders)
+        # pylint: disable=protected-access
+        self.assertIs(
+            transformer._get_class_transform(SimpleExpressionTransformer),
+            transformer._get_class_transform(SimpleExpressionTransformer),
+        )
+
+
+class CheckMatchesTest(unittest.TestCase):
+    def test_single_occurrences(self) -> None:
+        x = libcst.Name("x")
+        y = libcst.Name("y")
+        self.assertEqual(
+            transformer.check_matches({"a/1": x, "b/1": y}), {"a": x, "b": y}
+        )
+
+    def test_equivalent_occurrences(self) -> None:
+        first = libcst.parse_expression("x + 1")
+        second = libcst.parse_expression("x+1")
+        # Nodes compare by identity, so the first occurrence must be kept.
+        self.assertEqual(
+            transformer.check_matches({"a/2": second, "a/1": first}),
+            {"a": first},
+        )
+
+    def test_identical_occurrences(self) -> None:
+        first = libcst.parse_expression("x + 1")
+        second = libcst.parse_expression("x + 1")
+        self.assertEqual(
+            transformer.check_matches({"a/1": first, "a/2": second}),
+            {"a": first},
+        )
+
+    def test_different_occurrences(self) -> None:
+        self.assertIsNone(
+            transformer.check_matches(
+                {"a/1": libcst.Name("x"), "a/2": libcst.Name("y")}
+            )
+        )
+
+
 # pylint: disable=pointless-statement,no-self-use
 class ParameterizedExpressionTransformer(transformer.CraftierTransformer):
     def expression_before(self, x):
@@ -64,6 +122,9 @@ class ParameterizedExpressionTransformerTest(libcst.codemod.CodemodTest):
     def test_no_match(self) -> None:
         self.assertCodemod("length + 1", "length + 1")
 
+    def test_no_match_operator(self) -> None:
+        self.assertCodemod("length - 2", "length - 2")
+
     def test_match(self) -> None:
         self.assertCodemod("foo(bar + 2)", "foo(bar + 3)")
 
@@ -189,6 +250,27 @@ class AnyMatcherTopLevelTransformerTest(libcst.codemod.CodemodTest):
             AnyMatcherTopLevelTransformer(libcst.codemod.CodemodContext())
 
 
+# pylint: disable=pointless-statement,no-self-use
+class FormattedStringTopLevelTransformer(transformer.CraftierTransformer):
+    def expression_before(self, x):
+        f"{x}"
+
+    def expression_after(self, x):
+        str(x)
+
+
+# pylint: enable=pointless-statement,no-self-use
+
+
+class FormattedStringTopLevelTransformerTest(unittest.TestCase):
+    def test_raises_exception(self) -> None:
+        with self.assertRaisesRegex(
+            Exception,
+            "Formatted strings are not supported at top level",
+        ):
+            FormattedStringTopLevelTransformer(libcst.codemod.CodemodContext())
+
+
 # pylint: disable=pointless-statement,no-self-use
 class MultipleMatchersTransformer(transformer.CraftierTransformer):
     def expression1_before(self, x):
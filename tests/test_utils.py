@@ -34,3 +34,10 @@ class UtilsTest(unittest.TestCase):
             utils.to_string(libcst.parse_statement("return x + a[1]")).strip(),
             expected,
         )
+
+    def test_literal_eval(self) -> None:
+        self.assertEqual(utils.literal_eval("0x10"), 16)
+        self.assertEqual(utils.literal_eval("'a' 'b'"), "ab")
+        self.assertIs(utils.literal_eval("'abc'"), utils.literal_eval("'abc'"))
+        with self.assertRaises(ValueError):
+            utils.literal_eval("a")